@@ -8,32 +8,34 @@ error recovery capabilities.
 """
 
 import argparse
+import functools
 import os
-import subprocess
 import sys
+from typing import List, Optional
 
-from dotenv import load_dotenv
-from src.agents import GitHubIntegrationAgent
-from src.cli_interface import show_help_summary
-from src.code_explainer import explain_repository
-from src.discord_integration import start_discord_bot
+# Heavy modules (LangGraph workflow, discord.py, agents) are imported inside
+# the branch of main() that needs them so fast paths like --help stay cheap.
 
-# Import LangGraph workflow as the default
-from src.workflow import run_intelligent_workflow
+# Mode flags that can be handled without building the full parser, in the
+# same precedence order main() has always used to dispatch them.
+_MODE_FLAGS = (
+    ("--discord-bot", "discord_bot"),
+    ("--show-commands", "show_commands"),
+    ("--setup-auth", "setup_auth"),
+    ("--list-repos", "list_repos"),
+)
 
-# Load environment variables
-load_dotenv()
+# Flags whose next argv token is their value, which the sniff must skip
+_VALUE_FLAGS = frozenset(
+    {"--repo-url", "--workdir", "--branch", "--prompt", "--repo-limit", "--conda-env"}
+)
 
+_DEFAULT_REPO_URL = "https://github.com/ishandutta0098/open-clip"
 
-def main():
-    """Main entry point for the Orion AI Agent with LangGraph orchestration."""
-    parser = argparse.ArgumentParser(
-        description="Run Orion AI agent with intelligent LangGraph workflow orchestration",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 🚀 LANGGRAPH FEATURES:
   • Intelligent workflow routing based on context analysis
-  • Parallel agent execution for improved performance  
+  • Parallel agent execution for improved performance
   • Advanced error recovery with multiple retry strategies
   • State-based decision making throughout workflow
   • Built-in checkpointing and state persistence
@@ -42,82 +44,194 @@ def main():
 💡 TIP: Use --debug for detailed workflow information!
 💡 TIP: Use --conda-env [env_name] to specify conda environment (default: ml)
 💡 TIP: Use --no-venv to skip environment creation and use conda instead
-        """,
-    )
+        """
+
+
+class _DefaultRepr:
+    """
+    Placeholder argparse default that describes its value in --help.
+
+    The real value is computed after parsing, and only on the paths that use
+    it. Instances are falsy so ``args.value or fallback`` resolves them.
+    """
+
+    def __init__(self, description: str):
+        self.description = description
+
+    def __str__(self) -> str:
+        return self.description
+
+    __repr__ = __str__
+
+    def __bool__(self) -> bool:
+        return False
+
+
+def _sniff_argv(argv: List[str]) -> Optional[str]:
+    """
+    Detect a fast-path mode flag with a plain string scan of argv.
+
+    Args:
+        argv: Full argument vector (including the program name)
+
+    Returns:
+        Optional[str]: Mode name, or None if the full parser is required
+    """
+    flags = set()
+    tokens = iter(argv[1:])
+    for token in tokens:
+        if token == "--":
+            break
+        if token in _VALUE_FLAGS:
+            # Skip the value, e.g. --prompt "--list-repos"
+            next(tokens, None)
+        else:
+            flags.add(token)
+    if "-h" in flags or "--help" in flags:
+        return None
+
+    for flag, mode in _MODE_FLAGS:
+        if flag in flags:
+            return mode
+    return None
+
+
+def _add_debug_argument(parser: argparse.ArgumentParser) -> None:
+    """Register the --debug flag shared by every mode."""
     parser.add_argument(
-        "--list-repos",
+        "--debug",
         action="store_true",
-        help="List repositories from your GitHub account",
+        help="Enable debug mode to show raw API responses",
     )
+
+
+def _add_repository_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the repository location flags."""
     parser.add_argument(
         "--repo-url",
-        help="GitHub repository URL",
-        default="https://github.com/ishandutta0098/open-clip",
+        help="GitHub repository URL (default: %(default)s)",
+        default=_DefaultRepr(f"$ORION_REPO_URL or {_DEFAULT_REPO_URL}"),
     )
     parser.add_argument(
-        "--branch",
-        help="Name of the branch to work on",
-        default=None,
+        "--workdir",
+        help="Working directory for cloning (default: %(default)s)",
+        default=_DefaultRepr("$ORION_WORKDIR or <system temp dir>/orion"),
     )
+
+
+def _add_workflow_option_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the flags that tune how the workflow runs."""
     parser.add_argument(
-        "--prompt",
-        help="Instruction for the AI agent",
-        default="Create a python script to use clip model from transformers library",
+        "--no-testing", action="store_true", help="Disable code testing"
     )
     parser.add_argument(
-        "--workdir",
-        help="Working directory for cloning",
-        default="/Users/ishandutta/Documents/code/orion-backend",
+        "--no-venv", action="store_true", help="Disable virtual environment creation"
     )
     parser.add_argument(
-        "--repo-limit",
-        type=int,
-        default=5,
-        help="Number of repositories to list (default: 5)",
+        "--conda-env",
+        help="Conda environment to use for running code",
+        default="ml",
     )
     parser.add_argument(
-        "--setup-auth", action="store_true", help="Run authentication setup"
+        "--strict-testing", action="store_true", help="Abort commit if tests fail"
     )
     parser.add_argument(
-        "--debug",
-        action="store_true",
-        help="Enable debug mode to show raw API responses",
+        "--commit", action="store_true", help="Commit the generated changes"
     )
     parser.add_argument(
-        "--show-commands",
+        "--create-pr",
         action="store_true",
-        help="Show available commands and examples",
+        help="Create a pull request (requires --commit)",
     )
+
+
+def _add_repo_limit_argument(parser: argparse.ArgumentParser) -> None:
+    """Register the --repo-limit flag used by --list-repos."""
     parser.add_argument(
-        "--no-testing", action="store_true", help="Disable code testing"
+        "--repo-limit",
+        type=int,
+        default=5,
+        help="Number of repositories to list (default: 5)",
+    )
+
+
+@functools.cache
+def _build_full_parser() -> argparse.ArgumentParser:
+    """Build the complete parser used by the workflow and explain paths."""
+    parser = argparse.ArgumentParser(
+        description="Run Orion AI agent with intelligent LangGraph workflow orchestration",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
     parser.add_argument(
-        "--no-venv", action="store_true", help="Disable virtual environment creation"
+        "--list-repos",
+        action="store_true",
+        help="List repositories from your GitHub account",
     )
+    _add_repository_arguments(parser)
     parser.add_argument(
-        "--conda-env",
-        help="Conda environment to use for running code",
-        default="ml",
+        "--branch",
+        help="Name of the branch to work on",
+        default=None,
     )
     parser.add_argument(
-        "--strict-testing", action="store_true", help="Abort commit if tests fail"
+        "--prompt",
+        help="Instruction for the AI agent",
+        default="Create a python script to use clip model from transformers library",
     )
+    _add_repo_limit_argument(parser)
     parser.add_argument(
-        "--commit", action="store_true", help="Commit the generated changes"
+        "--setup-auth", action="store_true", help="Run authentication setup"
     )
+    _add_debug_argument(parser)
     parser.add_argument(
-        "--create-pr",
+        "--show-commands",
         action="store_true",
-        help="Create a pull request (requires --commit)",
+        help="Show available commands and examples",
     )
+    _add_workflow_option_arguments(parser)
     parser.add_argument(
         "--discord-bot",
         action="store_true",
         help="Run Discord bot to receive prompts",
     )
-    args = parser.parse_args()
+    return parser
 
-    if args.create_pr:
+
+@functools.cache
+def _build_mode_parser(mode: str) -> argparse.ArgumentParser:
+    """
+    Build a minimal parser declaring only the flags a fast-path mode consumes.
+
+    Args:
+        mode: Either "discord_bot" or "list_repos"
+
+    Returns:
+        argparse.ArgumentParser: Parser for the selected mode
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    _add_debug_argument(parser)
+    if mode == "discord_bot":
+        parser.add_argument("--discord-bot", action="store_true")
+        _add_repository_arguments(parser)
+        _add_workflow_option_arguments(parser)
+    else:
+        parser.add_argument("--list-repos", action="store_true")
+        _add_repo_limit_argument(parser)
+    return parser
+
+
+@functools.cache
+def _ensure_env() -> None:
+    """Load environment variables from .env once, only on paths that read them."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _prepare_args(args: argparse.Namespace) -> None:
+    """Apply shared post-processing to parsed arguments."""
+    if getattr(args, "create_pr", False):
         args.commit = True
 
     # Set debug mode if requested
@@ -128,85 +242,168 @@ def main():
         )
 
     # Validate argument combinations
-    if args.create_pr and not args.commit:
+    if getattr(args, "create_pr", False) and not args.commit:
         print("❌ Error: --create-pr requires --commit")
         print(
             "💡 Use: --commit --create-pr to commit changes and create a pull request"
         )
         sys.exit(1)
 
-    if args.discord_bot:
-        start_discord_bot(
-            repo_url=args.repo_url,
-            workdir=args.workdir,
-            commit_changes=args.commit,
-            create_pr=args.create_pr,
-            enable_testing=not args.no_testing,
-            create_venv=not args.no_venv,
-            conda_env=args.conda_env,
-            strict_testing=args.strict_testing,
-        )
-        return
 
-    if args.show_commands:
-        show_help_summary()
-    elif args.setup_auth:
-        print("🔧 Running authentication setup...")
-        subprocess.run(["python", "src/auth_setup.py"])
-    elif args.list_repos:
-        print("📚 Listing repositories from your GitHub account...")
+def _resolve_repository_defaults(args: argparse.Namespace) -> None:
+    """Compute the --repo-url and --workdir defaults on the paths that use them."""
+    import tempfile
 
-        # Use the new GitHub Integration Agent
-        github_agent = GitHubIntegrationAgent(debug=args.debug)
-        result = github_agent.list_repositories(args.repo_limit)
+    args.repo_url = (
+        args.repo_url or os.environ.get("ORION_REPO_URL") or _DEFAULT_REPO_URL
+    )
+    args.workdir = (
+        args.workdir
+        or os.environ.get("ORION_WORKDIR")
+        or os.path.join(tempfile.gettempdir(), "orion")
+    )
 
-        if result:
-            print(result)
-        else:
-            print("❌ Failed to list repositories")
 
-        print("\n💡 Tip: Use --debug flag for detailed LangGraph workflow information")
-        print("💡 Tip: LangGraph provides intelligent routing and error recovery")
+def _show_commands() -> None:
+    """Print the CLI command summary."""
+    from src.cli_interface import show_help_summary
+
+    show_help_summary()
+
+
+def _run_auth_setup() -> None:
+    """Run the interactive authentication setup."""
+    print("🔧 Running authentication setup...")
+    from src.auth_setup import main as auth_setup_main
+
+    auth_setup_main()
+
+
+def _run_discord_bot(args: argparse.Namespace) -> None:
+    """Start the Discord bot with the parsed workflow options."""
+    _ensure_env()
+    _resolve_repository_defaults(args)
+    from src.discord_integration import start_discord_bot
+
+    start_discord_bot(
+        repo_url=args.repo_url,
+        workdir=args.workdir,
+        commit_changes=args.commit,
+        create_pr=args.create_pr,
+        enable_testing=not args.no_testing,
+        create_venv=not args.no_venv,
+        conda_env=args.conda_env,
+        strict_testing=args.strict_testing,
+    )
+
+
+def _list_repositories(args: argparse.Namespace) -> None:
+    """List repositories from the authenticated GitHub account."""
+    print("📚 Listing repositories from your GitHub account...")
+
+    _ensure_env()
+    from src.agents.github_integration_agent import get_agent
+
+    # Use the new GitHub Integration Agent
+    github_agent = get_agent(args.debug)
+    result = github_agent.list_repositories(args.repo_limit)
+
+    if result:
+        print(result)
+    else:
+        print("❌ Failed to list repositories")
+
+    print("\n💡 Tip: Use --debug flag for detailed LangGraph workflow information")
+    print("💡 Tip: LangGraph provides intelligent routing and error recovery")
+    print("💡 Tip: Run 'python main.py --show-commands' to see all available commands")
+
+
+def _run_workflow(args: argparse.Namespace) -> None:
+    """Run the explain path or the full LangGraph workflow."""
+    _ensure_env()
+    _resolve_repository_defaults(args)
+    from src.agents.github_integration_agent import get_agent
+
+    # Check authentication before running the main workflow
+    github_agent = get_agent(args.debug)
+    if not github_agent.check_authentication():
+        print("\n💡 Tip: Run 'python main.py --setup-auth' to set up authentication")
         print(
             "💡 Tip: Run 'python main.py --show-commands' to see all available commands"
         )
-    else:
-        # Check authentication before running the main workflow
-        github_agent = GitHubIntegrationAgent(debug=args.debug)
-        if not github_agent.check_authentication():
-            print(
-                "\n💡 Tip: Run 'python main.py --setup-auth' to set up authentication"
-            )
-            print(
-                "💡 Tip: Run 'python main.py --show-commands' to see all available commands"
-            )
-            sys.exit(1)
-
-        if args.prompt.strip().lower() == "explain":
-            if args.commit or args.create_pr:
-                print("ℹ️ Explanation mode ignores commit and PR options.")
-            explain_repository(
-                args.repo_url,
-                args.workdir,
-                branch=args.branch,
-            )
-            return
+        sys.exit(1)
 
-        print(f"🤖 Running AI agent on repository: {args.repo_url}")
-        print(f"📝 Task: {args.prompt}")
-        print("✨ Using LangGraph for intelligent workflow orchestration")
-        run_intelligent_workflow(
+    if args.prompt.strip().lower() == "explain":
+        if args.commit or args.create_pr:
+            print("ℹ️ Explanation mode ignores commit and PR options.")
+        from src.code_explainer import explain_repository
+
+        explain_repository(
             args.repo_url,
-            args.prompt,
             args.workdir,
-            enable_testing=not args.no_testing,
-            create_venv=not args.no_venv,
-            conda_env=args.conda_env,
-            strict_testing=args.strict_testing,
-            commit_changes=args.commit,
-            create_pr=args.create_pr,
             branch=args.branch,
         )
+        return
+
+    print(f"🤖 Running AI agent on repository: {args.repo_url}")
+    print(f"📝 Task: {args.prompt}")
+    print("✨ Using LangGraph for intelligent workflow orchestration")
+    from src.workflow import run_intelligent_workflow
+
+    run_intelligent_workflow(
+        args.repo_url,
+        args.prompt,
+        args.workdir,
+        enable_testing=not args.no_testing,
+        create_venv=not args.no_venv,
+        conda_env=args.conda_env,
+        strict_testing=args.strict_testing,
+        commit_changes=args.commit,
+        create_pr=args.create_pr,
+        branch=args.branch,
+    )
+
+
+def main():
+    """Main entry point for the Orion AI Agent with LangGraph orchestration."""
+    # Export DEBUG before any lazy import fires, so modules that read it at
+    # import time (logging setup, backend selection) see the final value.
+    if "--debug" in sys.argv:
+        os.environ["DEBUG"] = "true"
+
+    # Fast paths never build the full parser
+    mode = _sniff_argv(sys.argv)
+    if mode == "show_commands":
+        _show_commands()
+        return
+    if mode == "setup_auth":
+        _run_auth_setup()
+        return
+    if mode in ("discord_bot", "list_repos"):
+        args, extras = _build_mode_parser(mode).parse_known_args()
+        # Anything else goes to the full parser, which accepts the other
+        # valid flags and rejects unknown ones
+        if not extras:
+            _prepare_args(args)
+            if mode == "discord_bot":
+                _run_discord_bot(args)
+            else:
+                _list_repositories(args)
+            return
+
+    args = _build_full_parser().parse_args()
+    _prepare_args(args)
+
+    if args.discord_bot:
+        _run_discord_bot(args)
+    elif args.show_commands:
+        _show_commands()
+    elif args.setup_auth:
+        _run_auth_setup()
+    elif args.list_repos:
+        _list_repositories(args)
+    else:
+        _run_workflow(args)
 
 
 if __name__ == "__main__":
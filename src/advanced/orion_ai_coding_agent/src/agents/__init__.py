@@ -3,28 +3,41 @@ Agents Package for Orion AI Agent System
 
 This package contains all the specialized agents that work together to provide
 AI-powered code generation and repository management capabilities.
+
+Agents are imported lazily on first attribute access (via ``lazy_loader``), so
+importing a single lightweight agent does not pull in the LangGraph/LangChain
+stack. Static analyzers read the exported names from ``__init__.pyi``.
 """
 
-from .ai_generator_agent import AIGeneratorAgent
-from .code_tester_agent import CodeTesterAgent
-from .environment_manager_agent import EnvironmentManagerAgent
-from .git_operations_agent import GitOperationsAgent
-from .github_integration_agent import GitHubIntegrationAgent
-from .langgraph_orchestrator_agent import LangGraphOrchestratorAgent
-from .repository_scanner_agent import RepositoryScannerAgent
-from .task_classifier_agent import TaskClassifierAgent
-
-# Keep the old name for backwards compatibility
-WorkflowOrchestratorAgent = LangGraphOrchestratorAgent
-
-__all__ = [
-    "AIGeneratorAgent",
-    "CodeTesterAgent",
-    "EnvironmentManagerAgent",
-    "GitOperationsAgent",
-    "GitHubIntegrationAgent",
-    "LangGraphOrchestratorAgent",
-    "WorkflowOrchestratorAgent",  # Backwards compatibility
-]
+import lazy_loader as lazy
+
+_lazy_getattr, _lazy_dir, _lazy_all = lazy.attach(
+    __name__,
+    submod_attrs={
+        "ai_generator_agent": ["AIGeneratorAgent"],
+        "code_tester_agent": ["CodeTesterAgent"],
+        "environment_manager_agent": ["EnvironmentManagerAgent"],
+        "git_operations_agent": ["GitOperationsAgent"],
+        "github_integration_agent": ["GitHubIntegrationAgent"],
+        "langgraph_orchestrator_agent": ["LangGraphOrchestratorAgent"],
+        "repository_scanner_agent": ["RepositoryScannerAgent"],
+        "task_classifier_agent": ["TaskClassifierAgent"],
+    },
+)
+
+__all__ = _lazy_all + ["WorkflowOrchestratorAgent"]  # Backwards compatibility
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name: str):
+    """Resolve agents lazily, including the backwards-compatible alias."""
+    # Keep the old name for backwards compatibility
+    if name == "WorkflowOrchestratorAgent":
+        return _lazy_getattr("LangGraphOrchestratorAgent")
+    return _lazy_getattr(name)
+
+
+def __dir__():
+    """List the lazily exported names, including the alias."""
+    return _lazy_dir() + ["WorkflowOrchestratorAgent"]
@@ -0,0 +1,28 @@
+from .ai_generator_agent import AIGeneratorAgent as AIGeneratorAgent
+from .code_tester_agent import CodeTesterAgent as CodeTesterAgent
+from .environment_manager_agent import (
+    EnvironmentManagerAgent as EnvironmentManagerAgent,
+)
+from .git_operations_agent import GitOperationsAgent as GitOperationsAgent
+from .github_integration_agent import GitHubIntegrationAgent as GitHubIntegrationAgent
+from .langgraph_orchestrator_agent import (
+    LangGraphOrchestratorAgent as LangGraphOrchestratorAgent,
+)
+from .repository_scanner_agent import RepositoryScannerAgent as RepositoryScannerAgent
+from .task_classifier_agent import TaskClassifierAgent as TaskClassifierAgent
+
+WorkflowOrchestratorAgent = LangGraphOrchestratorAgent
+
+__all__ = [
+    "AIGeneratorAgent",
+    "CodeTesterAgent",
+    "EnvironmentManagerAgent",
+    "GitOperationsAgent",
+    "GitHubIntegrationAgent",
+    "LangGraphOrchestratorAgent",
+    "RepositoryScannerAgent",
+    "TaskClassifierAgent",
+    "WorkflowOrchestratorAgent",
+]
+
+__version__: str
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Test harness for generated code.
+
+Runs a target script with dummy inputs and reports whether it executed
+cleanly. The Code Tester Agent runs this module inside the interpreter under
+test, so it must only depend on the standard library.
+
+Usage:
+    python _test_harness.py --target script.py [--needs-image] [--has-main-guard]
+"""
+
+import argparse
+import builtins
+import importlib
+import io
+import os
+import sys
+import tempfile
+from types import CodeType
+from typing import List, Optional
+
+
+def create_dummy_image():
+    """Create a dummy image for testing."""
+    try:
+        from PIL import Image
+        import numpy as np
+
+        # Create a small dummy image
+        dummy_img = Image.fromarray(
+            np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
+        )
+        return dummy_img
+    except ImportError:
+        return None
+
+
+# Content of every dummy file
+_DUMMY_FILE_CONTENT = (
+    b"This is a dummy file for testing purposes.\n"
+    b"It contains sample text content.\n"
+)
+
+# Named dummy files, removed after the run (O_TMPFILE ones need no cleanup)
+_named_dummy_files: List[str] = []
+
+
+def create_dummy_file() -> str:
+    """
+    Create a dummy file for testing.
+
+    On Linux the file is never named: it is an O_TMPFILE kept open for the
+    rest of the process and reached through /proc/self/fd, so it disappears
+    even if the test process is killed.
+    """
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(tempfile.gettempdir(), os.O_TMPFILE | os.O_RDWR, 0o600)
+        except OSError:
+            pass  # The temp filesystem doesn't support O_TMPFILE
+        else:
+            os.write(fd, _DUMMY_FILE_CONTENT)
+            return f"/proc/self/fd/{fd}"
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.write(fd, _DUMMY_FILE_CONTENT)
+    os.close(fd)
+    _named_dummy_files.append(path)
+    return path
+
+
+def mock_input_function(prompt: str = "") -> str:
+    """Mock input function that returns dummy values."""
+    if "image" in prompt.lower() or "file" in prompt.lower():
+        return create_dummy_file()
+    elif "text" in prompt.lower():
+        return "This is a sample text for testing"
+    else:
+        return "dummy_input"
+
+
+# The real open(), kept for files that exist and for writes
+_real_open = builtins.open
+
+
+def _safe_open(file, mode="r", *args, **kwargs):
+    """open() that serves dummy content when reading a file that doesn't exist."""
+    reading = not any(flag in mode for flag in "wax+")
+    if (
+        reading
+        and isinstance(file, (str, bytes, os.PathLike))
+        and not os.path.exists(file)
+    ):
+        if "b" in mode:
+            return io.BytesIO(b"dummy content")
+        return io.StringIO("dummy content")
+    return _real_open(file, mode, *args, **kwargs)
+
+
+def _run_target(
+    target: str, has_main_guard: bool, code: Optional[CodeType] = None
+) -> None:
+    """
+    Run the target script.
+
+    Args:
+        target: Path of the script, relative to the working directory
+        has_main_guard: Import the module and call its main()/run() instead
+            of executing the file as __main__
+        code: Compiled code of the target, used instead of its source when
+            executing it as __main__
+    """
+    if has_main_guard:
+        # If the script has a main guard, we can import it safely
+        module_name = target.replace(".py", "").replace(os.sep, ".")
+        module = importlib.import_module(module_name)
+
+        # If there's a main function, try to call it
+        if hasattr(module, "main"):
+            module.main()
+        elif hasattr(module, "run"):
+            module.run()
+    else:
+        # If no main guard, execute the file directly but carefully
+        if code is None:
+            with open(target, "r") as f:
+                code = f.read()
+
+        # Execute in a controlled environment
+        exec(code, {"__name__": "__main__"})
+
+
+def run(
+    target: str,
+    needs_image: bool = False,
+    has_main_guard: bool = False,
+    code: Optional[CodeType] = None,
+) -> bool:
+    """
+    Run the target with proper mocking and error handling.
+
+    Args:
+        target: Path of the script, relative to the working directory
+        needs_image: Replace PIL's Image.open with a dummy image
+        has_main_guard: Whether the target guards its entry point
+        code: Compiled code of the target, if the caller already has it
+
+    Returns:
+        bool: True if the target ran without errors
+    """
+    print(f"🧪 Testing {target}...")
+
+    # Add current directory to path
+    sys.path.insert(0, ".")
+
+    # Prepare dummy data
+    dummy_inputs = ["dummy_input", "test", "sample", create_dummy_file()]
+    input_counter = 0
+
+    def mock_input_with_counter(prompt=""):
+        nonlocal input_counter
+        if input_counter < len(dummy_inputs):
+            result = dummy_inputs[input_counter]
+            input_counter += 1
+            return str(result)
+        return mock_input_function(prompt)
+
+    # Additional mocks for image processing
+    if needs_image:
+        try:
+            from PIL import Image
+
+            dummy_image = create_dummy_image()
+            if dummy_image:
+                Image.open = lambda *args, **kwargs: dummy_image
+        except ImportError:
+            pass
+
+    # Capture stdout/stderr
+    old_stdout = sys.stdout
+    old_stderr = sys.stderr
+    captured_output = io.StringIO()
+    captured_errors = io.StringIO()
+
+    # This is a throwaway process, so plain assignment is enough to mock
+    # input() and open(); they are restored before reporting
+    real_input = builtins.input
+
+    try:
+        sys.stdout = captured_output
+        sys.stderr = captured_errors
+
+        # Mock input and other problematic functions
+        builtins.input = mock_input_with_counter
+        builtins.open = _safe_open
+        try:
+            _run_target(target, has_main_guard, code)
+        finally:
+            builtins.input = real_input
+            builtins.open = _real_open
+
+        # Restore stdout/stderr
+        sys.stdout = old_stdout
+        sys.stderr = old_stderr
+
+        # Check for any errors
+        error_output = captured_errors.getvalue()
+        if error_output and (
+            "error" in error_output.lower() or "exception" in error_output.lower()
+        ):
+            print("❌ Errors detected in output:")
+            print(error_output[:500])
+            return False
+
+        # Print captured output (truncated)
+        output = captured_output.getvalue()
+        if output:
+            print("✅ Script executed successfully. Output:")
+            print(output[:300] + "..." if len(output) > 300 else output)
+        else:
+            print("✅ Script executed successfully (no output)")
+
+        return True
+
+    except Exception as e:
+        # Restore stdout/stderr
+        sys.stdout = old_stdout
+        sys.stderr = old_stderr
+
+        print(f"❌ Execution failed: {type(e).__name__}: {e}")
+        return False
+
+    finally:
+        # Clean up any named temporary files
+        while _named_dummy_files:
+            try:
+                os.unlink(_named_dummy_files.pop())
+            except OSError:
+                pass
+
+
+def main(argv: Optional[List[str]] = None, code: Optional[CodeType] = None) -> bool:
+    """
+    Parse harness arguments and run the target.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+        code: Compiled code of the target, if the caller already has it
+
+    Returns:
+        bool: True if the target ran without errors
+    """
+    parser = argparse.ArgumentParser(description="Run a script with dummy inputs")
+    parser.add_argument("--target", required=True, help="Script to run")
+    parser.add_argument(
+        "--needs-image", action="store_true", help="Mock PIL's Image.open"
+    )
+    parser.add_argument(
+        "--has-main-guard",
+        action="store_true",
+        help="Import the module and call main()/run() instead of executing it",
+    )
+    args = parser.parse_args(argv)
+    return run(args.target, args.needs_image, args.has_main_guard, code)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -5,20 +5,634 @@ This agent handles AI-powered code generation using LangChain and GPT-5.
 Simplified for GPT-5 only usage with best practices integration.
 """
 
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import hashlib
+import io
 import json
+import math
 import os
 import re
-import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional
+import weakref
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import aiofiles
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+from rapidfuzz import fuzz
+
+from ..base_agent import BaseAgent
+
+# LangChain, langchain-openai and httpx are imported on first agent
+# construction, so tools that only use the module-level helpers stay cheap
+if TYPE_CHECKING:
+    import httpx
+
+# Source file extensions listed in the generation context
+_CODE_EXTS = frozenset({".py", ".js", ".ts", ".java", ".go", ".rs"})
+# Directories never descended into when listing context files
+_SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__"})
+# Maximum number of existing files listed in the generation context
+_MAX_CONTEXT_FILES = 10
+# FILE:/MODIFY: directives and code fences in plain-text generations
+_DIRECTIVE_RE = re.compile(
+    r"^(?:(?P<kind>FILE|MODIFY): (?P<name>.*)|(?P<fence>```.*))$", re.MULTILINE
+)
+# Code-quality heuristics; each matches at most once per line
+_COMPLEXITY_RE = re.compile(r"^[^\n]*?(?:if |for |while |def |class )", re.MULTILINE)
+_IMPORT_RE = re.compile(r"^\s*(?:import |from )", re.MULTILINE)
+_NON_EMPTY_LINE_RE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+# Files per task handed to analyze_codebase worker processes
+_ANALYSIS_CHUNKSIZE = 16
+# Maximum number of generation/file records kept in the agent's history
+_MAX_HISTORY = 1000
+# Modifications less similar than this to the original file are rejected
+_MIN_MODIFY_SIMILARITY = 0.5
+# Default HTTP connection pool size and request timeout (seconds) for the LLM
+_DEFAULT_MAX_CONNECTIONS = 2000
+_DEFAULT_TIMEOUT = 120.0
+# Output token cap per request, also reserved up front by the rate limiter
+_MAX_OUTPUT_TOKENS = 32768
+# Rough prompt-token overhead of the static system and user templates
+_PROMPT_OVERHEAD_TOKENS = 1024
+# Routes requests sharing the static system prompts to the same prompt cache
+_PROMPT_CACHE_KEY = "orion-codegen-v1"
+
+_CLIENT_LOCK = threading.Lock()
+_HTTP_CLIENTS: Dict[Tuple[int, float], Tuple["httpx.Client", "httpx.AsyncClient"]] = {}
+
+
+def _close_http_clients(
+    sync_client: "httpx.Client", async_client: "httpx.AsyncClient"
+) -> None:
+    """Close a shared client pair at interpreter exit."""
+    sync_client.close()
+    try:
+        asyncio.run(async_client.aclose())
+    except Exception:
+        pass  # Whatever is left open is dropped with the process
+
+
+async def _aclose_quietly(client: "httpx.AsyncClient") -> None:
+    """Close an async client whose connections may belong to a closed loop."""
+    try:
+        await client.aclose()
+    except Exception:
+        pass  # The dead loop's sockets are released when garbage collected
+
+
+@functools.cache
+def _loop_local_async_client_class() -> type:
+    """
+    Define the async client that keeps a connection pool per event loop.
+
+    Defined on first use so that httpx is only imported when needed.
+
+    Returns:
+        type: httpx.AsyncClient subclass
+    """
+    import httpx
+
+    class _LoopLocalAsyncClient(httpx.AsyncClient):
+        """
+        httpx.AsyncClient that sends each request through the running loop's pool.
+
+        Pooled connections belong to the event loop that opened them, so a
+        single pool can't serve successive asyncio.run() calls. Pools of
+        loops that have since closed are closed when the next pool is made.
+        """
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self._pool_kwargs = kwargs
+            # Client per event loop, dropped once the loop is garbage collected
+            self._loop_clients = weakref.WeakKeyDictionary()
+            self._loop_clients_lock = threading.Lock()
+
+        async def _loop_client(self) -> httpx.AsyncClient:
+            """Get the running loop's client, creating it on first use."""
+            loop = asyncio.get_running_loop()
+            stale = []
+            with self._loop_clients_lock:
+                client = self._loop_clients.get(loop)
+                if client is None:
+                    for other in list(self._loop_clients.keys()):
+                        if other.is_closed():
+                            stale.append(self._loop_clients.pop(other))
+                    client = httpx.AsyncClient(**self._pool_kwargs)
+                    self._loop_clients[loop] = client
+            for old_client in stale:
+                await _aclose_quietly(old_client)
+            return client
+
+        async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+            client = await self._loop_client()
+            return await client.send(request, **kwargs)
+
+        async def aclose(self) -> None:
+            with self._loop_clients_lock:
+                clients = list(self._loop_clients.values())
+                self._loop_clients.clear()
+            for client in clients:
+                await _aclose_quietly(client)
+            await super().aclose()
+
+    return _LoopLocalAsyncClient
+
+
+def _get_http_clients(
+    max_connections: int, timeout: float
+) -> Tuple["httpx.Client", "httpx.AsyncClient"]:
+    """
+    Get the shared HTTP clients for a pool size and timeout, creating them once.
+
+    All agents with the same settings reuse one connection pool, and HTTP/2
+    multiplexes concurrent requests over a few TLS connections.
+
+    Args:
+        max_connections: Maximum number of open connections per client
+        timeout: Request timeout in seconds
+
+    Returns:
+        Tuple of the shared sync and async clients
+    """
+    import httpx
+
+    key = (max_connections, timeout)
+    with _CLIENT_LOCK:
+        clients = _HTTP_CLIENTS.get(key)
+        if clients is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections * 3 // 4,
+            )
+            clients = (
+                httpx.Client(limits=limits, timeout=timeout, http2=True),
+                _loop_local_async_client_class()(
+                    limits=limits, timeout=timeout, http2=True
+                ),
+            )
+            _HTTP_CLIENTS[key] = clients
+            atexit.register(_close_http_clients, *clients)
+        return clients
+
+
+class _RateLimiter:
+    """
+    Request-per-minute and token-per-minute token buckets for LLM calls.
+
+    Buckets refill continuously based on elapsed time, so no background task
+    is needed and one limiter can be used from successive event loops.
+    Callers reserve an estimated token count up front and reconcile it with
+    the reported usage once the response arrives.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Request quota per minute (None for unlimited)
+            tokens_per_minute: Token quota per minute (None for unlimited)
+        """
+        self.rpm_capacity = float(requests_per_minute or "inf")
+        self.tpm_capacity = float(tokens_per_minute or "inf")
+        self._requests = self.rpm_capacity
+        self._tokens = self.tpm_capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        """Top up both buckets for the time elapsed since the last refill."""
+        now = time.monotonic()
+        minutes = (now - self._updated) / 60
+        self._updated = now
+        self._requests = min(
+            self.rpm_capacity, self._requests + minutes * self.rpm_capacity
+        )
+        self._tokens = min(
+            self.tpm_capacity, self._tokens + minutes * self.tpm_capacity
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request and ``tokens`` tokens are available, then take them.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+        """
+        tokens = min(tokens, self.tpm_capacity)
+        while True:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return
+
+            # Sleep until the scarcer bucket has refilled enough; unlimited
+            # buckets never run short (and inf / inf would be nan)
+            wait = max(
+                (
+                    (needed - available) / capacity
+                    for needed, available, capacity in (
+                        (1, self._requests, self.rpm_capacity),
+                        (tokens, self._tokens, self.tpm_capacity),
+                    )
+                    if math.isfinite(capacity)
+                ),
+                default=0,
+            )
+            await asyncio.sleep(max(wait * 60, 0.01))
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """
+        Return over-reserved tokens (or charge the shortfall) after a response.
+
+        Args:
+            estimated: Tokens reserved by acquire()
+            actual: Tokens reported in the response usage
+        """
+        self._tokens = min(self.tpm_capacity, self._tokens + estimated - actual)
+
+
+def _content_similarity(original: str, modified: str) -> float:
+    """
+    Similarity ratio between two file contents, in the range [0, 1].
+
+    The ratio can never exceed ``2 * min(len) / (len_a + len_b)``, so when
+    that bound is already below the acceptance threshold it is returned
+    without comparing the contents at all.
+
+    Args:
+        original: Original file content
+        modified: Modified file content
+
+    Returns:
+        float: Similarity ratio (or its length-based upper bound)
+    """
+    total = len(original) + len(modified)
+    if not total:
+        return 1.0
+    upper_bound = 2 * min(len(original), len(modified)) / total
+    if upper_bound < _MIN_MODIFY_SIMILARITY:
+        return upper_bound
+    return fuzz.ratio(original, modified) / 100.0
+
+
+def _write_bytes(path: str, data: bytes, dir_fd: Optional[int] = None) -> None:
+    """
+    Write bytes to a file with raw os.open/os.write, bypassing TextIOWrapper.
+
+    Args:
+        path: Destination file path (created or truncated)
+        data: Encoded file content
+        dir_fd: Open directory descriptor that ``path`` is relative to
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _open_dir_fd(dir_path: str) -> Optional[int]:
+    """
+    Create a directory if needed and open it for dir_fd-relative writes.
+
+    Args:
+        dir_path: Directory to open ("" for the current directory)
+
+    Returns:
+        Optional[int]: Directory descriptor, or None if the platform lacks
+        dir_fd support or the directory cannot be opened
+    """
+    if os.open not in os.supports_dir_fd:
+        return None
+    try:
+        dir_path = dir_path or "."
+        os.makedirs(dir_path, exist_ok=True)
+        return os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return None
+
+
+def _ensure_parent_dir(full_path: str, created_dirs: Optional[Set[str]]) -> None:
+    """
+    Create the parent directory of a file, at most once per batch.
+
+    Args:
+        full_path: Path of the file about to be written
+        created_dirs: Directories already created in this batch (updated in place)
+    """
+    dir_path = os.path.dirname(full_path)
+    if not dir_path or (created_dirs is not None and dir_path in created_dirs):
+        return
+    os.makedirs(dir_path, exist_ok=True)
+    if created_dirs is not None:
+        created_dirs.add(dir_path)
+
+
+def _analyze_code_quality(code: str, filename: str = "unknown.py") -> Dict[str, Any]:
+    """
+    Compute basic code-quality metrics for one file.
+
+    Args:
+        code: Code to analyze
+        filename: Name of the file
+
+    Returns:
+        Dictionary with quality metrics
+    """
+    return {
+        "filename": filename,
+        "total_lines": code.count("\n") + 1,
+        "non_empty_lines": len(_NON_EMPTY_LINE_RE.findall(code)),
+        "has_docstrings": '"""' in code or "'''" in code,
+        "has_type_hints": "->" in code or ": " in code,
+        "has_imports": _IMPORT_RE.search(code) is not None,
+        "complexity_estimate": len(_COMPLEXITY_RE.findall(code)),
+    }
+
+
+def _analyze_code_quality_worker(file: Tuple[str, str]) -> Dict[str, Any]:
+    """
+    Process-pool entry point for analyze_codebase (must stay module-level).
+
+    Args:
+        file: (filename, code) pair
 
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel, Field
+    Returns:
+        Dictionary with quality metrics
+    """
+    filename, code = file
+    return _analyze_code_quality(code, filename)
+
+
+def _apply_line_edits(content: str, edits: Any) -> Optional[Tuple[str, int]]:
+    """
+    Splice structured line edits into a file.
+
+    Args:
+        content: Original file content
+        edits: List of {"line_start", "line_end", "replacement"} dicts using
+            1-based inclusive line numbers of the original file
+
+    Returns:
+        Optional[Tuple[str, int]]: Modified content and the number of changed
+        lines, or None if the edits are malformed or overlap
+    """
+    if not isinstance(edits, list) or not edits:
+        return None
+
+    lines = content.splitlines(keepends=True)
+    spans = []
+    for edit in edits:
+        if not isinstance(edit, dict):
+            return None
+        start, end = edit.get("line_start"), edit.get("line_end")
+        replacement = edit.get("replacement", "")
+        if not (
+            isinstance(start, int)
+            and isinstance(end, int)
+            and isinstance(replacement, str)
+            and 1 <= start <= len(lines) + 1
+            and start - 1 <= end <= len(lines)
+        ):
+            return None
+        spans.append((start, end, replacement))
+
+    spans.sort(key=lambda span: span[0])
+    for (_, prev_end, _), (start, _, _) in zip(spans, spans[1:]):
+        if start <= prev_end:
+            return None
+
+    # Splice from the bottom up so earlier line numbers stay valid
+    changed = 0
+    for start, end, replacement in reversed(spans):
+        new_lines = replacement.splitlines(keepends=True)
+        # Checked against the lines as spliced so far, since an insertion
+        # below this edit may already have extended the file
+        at_eof_without_newline = end == len(lines) and not (
+            lines[-1] if lines else content
+        ).endswith("\n")
+        if at_eof_without_newline and lines and start > len(lines):
+            # Appending to a file without a final newline: end its last line
+            lines[-1] += "\n"
+        if new_lines and not new_lines[-1].endswith("\n"):
+            if not at_eof_without_newline:
+                new_lines[-1] += "\n"
+        lines[start - 1 : end] = new_lines
+        changed += max(end - start + 1, len(new_lines))
+
+    return "".join(lines), changed
+
+
+def _lines_between(text: str, pos: int, end: Optional[int]) -> Optional[str]:
+    """
+    Slice the lines that sit strictly between two directive lines.
+
+    Args:
+        text: Full generated text
+        pos: End offset of the previous directive match
+        end: Start offset of the next directive match, or None for end of text
+
+    Returns:
+        Optional[str]: The lines joined by newlines, or None if there are none
+    """
+    if end is None:
+        return text[pos + 1 :] if pos < len(text) else None
+    return text[pos + 1 : end - 1] if end > pos + 1 else None
+
+
+def _scan_code_files(repo_path: str, limit: int = _MAX_CONTEXT_FILES) -> List[str]:
+    """
+    List up to ``limit`` code files in a repository, breadth first.
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
+    Hidden and vendored directories are skipped, and the walk stops as soon as
+    enough files have been found.
+
+    Args:
+        repo_path: Path to the repository
+        limit: Maximum number of files to return
+
+    Returns:
+        List of file paths relative to repo_path
+    """
+    files = []
+    pending = deque([repo_path])
+    while pending:
+        with os.scandir(pending.popleft()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS and not entry.name.startswith("."):
+                        pending.append(entry.path)
+                elif os.path.splitext(entry.name)[1] in _CODE_EXTS:
+                    files.append(os.path.relpath(entry.path, repo_path))
+                    if len(files) == limit:
+                        return files
+    return files
+
+
+@functools.lru_cache(maxsize=32)
+def _scan_repo_files(repo_path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """
+    Cached variant of _scan_code_files keyed by the repository root's mtime.
+
+    Adding, removing or renaming an entry at the top level changes the root
+    mtime and so invalidates the entry; changes confined to subdirectories
+    are picked up after reset_context_cache().
+
+    Args:
+        repo_path: Repository root to scan
+        mtime_ns: st_mtime_ns of the repository root (cache key only)
+
+    Returns:
+        Tuple[str, ...]: Relative paths of up to _MAX_CONTEXT_FILES code files
+    """
+    return tuple(_scan_code_files(repo_path))
+
+
+# Static system prompts are sent as literal messages, so only the user
+# messages go through the template formatter. They must stay free of per-call
+# values (paths, model names, timestamps) so the request prefix is identical
+# every time and eligible for server-side prompt caching.
+_GENERATION_SYSTEM_TEXT = """You are an expert software architect using GPT-5's advanced capabilities.
+
+CORE COMPETENCIES:
+- Software architecture and design patterns
+- Modern development practices and frameworks  
+- Code quality, security, and performance optimization
+- Cross-platform and cloud-native development
+
+OUTPUT REQUIREMENTS:
+You MUST respond with valid JSON in this exact structure:
+{
+  "success": true,
+  "files": [
+    {"name": "filename.py", "content": "complete production-ready code"},
+    {"name": "requirements.txt", "content": "package==version\\npackage2==version"}
+  ],
+  "modifications": [
+    {"target": "existing_file.py", "changes": "specific changes to make"}
+  ],
+  "reasoning": "Detailed step-by-step analysis of the problem, solution approach, design decisions, and trade-offs considered",
+  "dependencies": ["package1", "package2"],
+  "next_steps": ["step 1", "step 2"],
+  "confidence": 0.95
+}
+
+REASONING PROCESS:
+1. ANALYZE: Break down requirements and constraints
+2. DESIGN: Plan architecture and component interactions  
+3. IMPLEMENT: Generate production-ready code with best practices
+4. VALIDATE: Consider edge cases, security, and performance
+
+QUALITY STANDARDS:
+- Complete, runnable code with all imports
+- Comprehensive error handling and logging
+- Type hints and detailed Google-style docstrings
+- Security best practices and input validation
+- Performance optimization and resource management"""
+
+_GENERATION_USER_TEMPLATE = """DEVELOPMENT TASK:
+Repository: {repo_path}
+Task: {prompt}
+
+CONTEXT:
+{context}
+
+REQUIREMENTS:
+Generate a complete, production-ready solution that follows best practices.
+Include detailed reasoning about your approach and design decisions.
+Consider scalability, maintainability, and security in your solution."""
+
+_FALLBACK_SYSTEM_TEXT = """You are an expert Python developer using GPT-5. Generate complete, production-ready code files.
+
+OUTPUT FORMAT:
+For each file, use this EXACT format:
+
+FILE: filename.py
+```python
+# Complete file content with imports, classes, functions
+# Include proper docstrings and type hints
+```
+
+REQUIREMENTS:
+- Complete, runnable code
+- All necessary imports
+- Google-style docstrings  
+- Type hints
+- Error handling
+- Follow PEP 8"""
+
+_FALLBACK_USER_TEMPLATE = "Repository: {repo_path}\nTask: {prompt}\nContext: {context}"
+
+_MODIFY_SYSTEM_TEXT = """You are a precise code editor using GPT-5's advanced capabilities.
+
+TASK: Modify code files with surgical precision while preserving all existing functionality.
+
+CRITICAL RULES:
+- Make ONLY the requested change - do not refactor, reorganize, or "improve" other code
+- Preserve ALL existing imports, comments, formatting, and structure
+- Maintain the exact same file structure and organization
+- Keep all existing functionality intact
+- If changing a value, change ONLY that specific value
+- If modifying a function, change ONLY what was requested
+
+OUTPUT: Return the complete modified file content with only the minimal necessary change applied."""
+
+_MODIFY_USER_TEMPLATE = """MODIFICATION REQUEST: {modification_description}
+
+ORIGINAL FILE CONTENT:
+```
+{existing_content}
+```
+
+Apply the requested change with surgical precision, keeping everything else exactly the same:"""
+
+_EDIT_SYSTEM_TEXT = """You are a precise code editor using GPT-5's advanced capabilities.
+
+TASK: Modify code files with surgical precision while preserving all existing functionality.
+
+CRITICAL RULES:
+- Make ONLY the requested change - do not refactor, reorganize, or "improve" other code
+- Preserve ALL existing imports, comments, formatting, and structure
+- Keep all existing functionality intact
+- If changing a value, change ONLY that specific value
+- If modifying a function, change ONLY what was requested
+
+OUTPUT: Respond with valid JSON listing only the lines that change:
+{
+  "edits": [
+    {"line_start": 12, "line_end": 14, "replacement": "new content for lines 12-14\\n"}
+  ]
+}
+
+EDIT RULES:
+- Line numbers are 1-based, inclusive, and refer to the ORIGINAL file
+- To insert without deleting, set line_end to line_start - 1 (inserts before line_start)
+- To delete lines, use an empty replacement
+- Edits must not overlap
+- Replacements contain complete lines, without the line number prefixes"""
+
+_EDIT_USER_TEMPLATE = """MODIFICATION REQUEST: {modification_description}
+
+ORIGINAL FILE CONTENT (line numbers are not part of the file):
+```
+{numbered_content}
+```
+
+Return the minimal edits that apply the requested change:"""
 
 
 class CodeGenerationResponse(BaseModel):
@@ -41,6 +655,36 @@ class CodeGenerationResponse(BaseModel):
     )
 
 
+@functools.cache
+def _fast_json_parser_class() -> type:
+    """
+    Build the orjson-backed JSON output parser class on first use.
+
+    Returns:
+        type: JsonOutputParser subclass that decodes complete replies with orjson
+    """
+    from langchain_core.output_parsers import JsonOutputParser
+
+    class _FastJsonParser(JsonOutputParser):
+        """
+        JSON output parser that decodes complete replies with orjson.
+
+        Partial results while streaming, and replies that are not bare JSON
+        (for example wrapped in a markdown fence), still go through
+        JsonOutputParser.
+        """
+
+        def parse_result(self, result: List[Any], *, partial: bool = False) -> Any:
+            if not partial:
+                try:
+                    return orjson.loads(result[0].text)
+                except orjson.JSONDecodeError:
+                    pass
+            return super().parse_result(result, partial=partial)
+
+    return _FastJsonParser
+
+
 class AIGeneratorAgent(BaseAgent):
     """
     Agent responsible for AI-powered code generation using GPT-5.
@@ -53,8 +697,31 @@ class AIGeneratorAgent(BaseAgent):
     - Code quality analysis and validation
     """
 
+    # execute() action name -> method name, resolved on the instance per call
+    _ACTION_TO_METHOD = {
+        "generate": "generate_code_changes",
+        "generate_batch": "generate_code_changes_batch",
+        "generate_with_context": "generate_code_with_context",
+        "apply": "make_code_changes",
+        "modify": "modify_existing_file",
+        "extract": "extract_python_code_from_text",
+        "analyze": "analyze_code_quality",
+        "analyze_codebase": "analyze_codebase",
+        "history": "get_generation_history",
+        "files": "get_created_files",
+        "modified_files": "get_modified_files",
+        "model_info": "get_model_info",
+    }
+
     def __init__(
-        self, model: str = "gpt-5-mini", temperature: float = 1.0, debug: bool = False
+        self,
+        model: str = "gpt-5-mini",
+        temperature: float = 1.0,
+        debug: bool = False,
+        max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+        timeout: float = _DEFAULT_TIMEOUT,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
     ):
         """https://docs.google.com/presentation/d/1p-GZmQFdUvU00q6jTyPJHyPhVsP783_NFlPHqjvOzgU/edit?usp=sharing
         Initialize the AI Generator Agent with GPT-5.
@@ -63,6 +730,10 @@ class AIGeneratorAgent(BaseAgent):
             model: GPT-5 model to use (gpt-5, gpt-5-mini, gpt-5-nano, or gpt-5-chat)
             temperature: Temperature for generation (0.1 for deterministic code)
             debug: Whether to enable debug mode
+            max_connections: Size of the shared HTTP connection pool
+            timeout: LLM request timeout in seconds
+            requests_per_minute: Async request quota (default: $ORION_OPENAI_RPM)
+            tokens_per_minute: Async token quota (default: $ORION_OPENAI_TPM)
         """
         super().__init__("AIGenerator", debug)
         self.model = model
@@ -74,19 +745,101 @@ class AIGeneratorAgent(BaseAgent):
                 f"⚠️ Warning: {model} is not a GPT-5 model. Consider using gpt-5-mini for best results."
             )
 
-        # Initialize LangChain components
+        from langchain_openai import ChatOpenAI
+
+        # Initialize LangChain components on the shared connection pools
+        http_client, http_async_client = _get_http_clients(max_connections, timeout)
         self.llm = ChatOpenAI(
             model=model,
             temperature=temperature,
-            max_tokens=32768,
+            max_tokens=_MAX_OUTPUT_TOKENS,
+            streaming=True,
+            stream_usage=True,
+            timeout=timeout,
+            http_client=http_client,
+            http_async_client=http_async_client,
             model_kwargs={"response_format": {"type": "json_object"}},
+            # Sent in the raw request body, so older SDKs pass it through
+            extra_body={"prompt_cache_key": _PROMPT_CACHE_KEY},
+        )
+
+        # Throttle async calls proactively instead of retrying on 429s
+        requests_per_minute = requests_per_minute or int(
+            os.environ.get("ORION_OPENAI_RPM", 0)
         )
+        tokens_per_minute = tokens_per_minute or int(
+            os.environ.get("ORION_OPENAI_TPM", 0)
+        )
+        self._rate_limiter = (
+            _RateLimiter(requests_per_minute, tokens_per_minute)
+            if requests_per_minute or tokens_per_minute
+            else None
+        )
+
+        # Prompt templates, parsers and chains are invariant per agent, so
+        # build them once instead of on every request
+        self._build_chains()
 
         self.update_state("model", model)
         self.update_state("temperature", temperature)
-        self.update_state("generated_code", [])
-        self.update_state("created_files", [])
-        self.update_state("modified_files", [])
+        # Bounded, append-only histories; the state keys reference the same
+        # deques, so recording an entry never copies or rewrites the list
+        self._generated_code = deque(maxlen=_MAX_HISTORY)
+        self._created_files = deque(maxlen=_MAX_HISTORY)
+        self._modified_files = deque(maxlen=_MAX_HISTORY)
+        self.update_state("generated_code", self._generated_code)
+        self.update_state("created_files", self._created_files)
+        self.update_state("modified_files", self._modified_files)
+
+    def _build_chains(self) -> None:
+        """Build the prompt templates, output parsers and LLM chains."""
+        from langchain_core.messages import SystemMessage
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import (
+            ChatPromptTemplate,
+            HumanMessagePromptTemplate,
+        )
+
+        fast_json_parser = _fast_json_parser_class()
+
+        # Enhanced prompt template for GPT-5
+        self._gen_template = ChatPromptTemplate.from_messages(
+            [
+                SystemMessage(content=_GENERATION_SYSTEM_TEXT),
+                HumanMessagePromptTemplate.from_template(_GENERATION_USER_TEMPLATE),
+            ]
+        )
+
+        # Use structured output parser
+        self._json_parser = fast_json_parser(pydantic_object=CodeGenerationResponse)
+        self._gen_llm_chain = self._gen_template | self.llm
+        self._gen_chain = self._gen_llm_chain | self._json_parser
+
+        self._fallback_template = ChatPromptTemplate.from_messages(
+            [
+                SystemMessage(content=_FALLBACK_SYSTEM_TEXT),
+                HumanMessagePromptTemplate.from_template(_FALLBACK_USER_TEMPLATE),
+            ]
+        )
+        self._str_parser = StrOutputParser()
+        self._fallback_llm_chain = self._fallback_template | self.llm
+        self._fallback_chain = self._fallback_llm_chain | self._str_parser
+
+        self._modify_template = ChatPromptTemplate.from_messages(
+            [
+                SystemMessage(content=_MODIFY_SYSTEM_TEXT),
+                HumanMessagePromptTemplate.from_template(_MODIFY_USER_TEMPLATE),
+            ]
+        )
+        self._modify_chain = self._modify_template | self.llm | StrOutputParser()
+
+        self._edit_template = ChatPromptTemplate.from_messages(
+            [
+                SystemMessage(content=_EDIT_SYSTEM_TEXT),
+                HumanMessagePromptTemplate.from_template(_EDIT_USER_TEMPLATE),
+            ]
+        )
+        self._edit_chain = self._edit_template | self.llm | fast_json_parser()
 
     def generate_code_changes(
         self, prompt: str, repo_path: str, context: Optional[Dict] = None
@@ -104,128 +857,257 @@ class AIGeneratorAgent(BaseAgent):
         """
 
         def _generation_operation():
-            # Enhanced prompt template for GPT-5
-            template = ChatPromptTemplate.from_messages(
-                [
-                    (
-                        "system",
-                        """You are an expert software architect using GPT-5's advanced capabilities.
+            # Prepare context
+            context_str = self._build_context(context, repo_path)
 
-CORE COMPETENCIES:
-- Software architecture and design patterns
-- Modern development practices and frameworks  
-- Code quality, security, and performance optimization
-- Cross-platform and cloud-native development
+            self.log(f"🚀 Generating with GPT-5 model: {self.model}")
 
-OUTPUT REQUIREMENTS:
-You MUST respond with valid JSON in this exact structure:
-{{
-  "success": true,
-  "files": [
-    {{"name": "filename.py", "content": "complete production-ready code"}},
-    {{"name": "requirements.txt", "content": "package==version\\npackage2==version"}}
-  ],
-  "modifications": [
-    {{"target": "existing_file.py", "changes": "specific changes to make"}}
-  ],
-  "reasoning": "Detailed step-by-step analysis of the problem, solution approach, design decisions, and trade-offs considered",
-  "dependencies": ["package1", "package2"],
-  "next_steps": ["step 1", "step 2"],
-  "confidence": 0.95
-}}
+            try:
+                result = self._gen_chain.invoke(
+                    {
+                        "prompt": prompt,
+                        "repo_path": repo_path,
+                        "context": context_str,
+                    }
+                )
+
+                return self._record_generation(prompt, repo_path, context, result)
+
+            except Exception as e:
+                self.log(f"❌ GPT-5 generation failed: {e}", "error")
+                return self._fallback_generation(prompt, repo_path, context_str)
+
+        return self.execute_with_tracking(
+            "generate_code_changes", _generation_operation
+        )
+
+    async def agenerate_code_changes(
+        self, prompt: str, repo_path: str, context: Optional[Dict] = None
+    ) -> Optional[str]:
+        """
+        Generate code changes using GPT-5 without blocking the event loop.
+
+        Args:
+            prompt: Task description for the AI
+            repo_path: Path to the repository
+            context: Additional context for generation
+
+        Returns:
+            str: Generated code changes with reasoning, or None if failed
+        """
+        context_str = self._build_context(context, repo_path)
+        inputs = {"prompt": prompt, "repo_path": repo_path, "context": context_str}
+
+        self.log(f"🚀 Generating asynchronously with GPT-5 model: {self.model}")
+        start_time = time.time()
+
+        try:
+            try:
+                result = await self._ainvoke_throttled(
+                    self._gen_llm_chain, self._json_parser, inputs
+                )
+                formatted_result = self._record_generation(
+                    prompt, repo_path, context, result
+                )
+            except Exception as e:
+                self.log(f"❌ GPT-5 generation failed: {e}", "error")
+                self.log("🔄 Using fallback generation method...")
+                formatted_result = await self._ainvoke_throttled(
+                    self._fallback_llm_chain, self._str_parser, inputs
+                )
+
+            self.record_execution(
+                "agenerate_code_changes", formatted_result, time.time() - start_time
+            )
+            return formatted_result
+
+        except Exception as e:
+            self.record_execution("agenerate_code_changes", e, time.time() - start_time)
+            self.log(f"❌ Async generation failed: {e}", "error")
+            return None
+
+    async def _ainvoke_throttled(
+        self, llm_chain: Any, parser: Any, inputs: Dict[str, str]
+    ) -> Any:
+        """
+        Invoke a prompt|llm chain under the rate limiter, then parse the reply.
+
+        Args:
+            llm_chain: Chain producing the raw AI message
+            parser: Output parser applied to the message
+            inputs: Template variables
+
+        Returns:
+            Parsed model output
+        """
+        if self._rate_limiter is None:
+            return await parser.ainvoke(await llm_chain.ainvoke(inputs))
 
-REASONING PROCESS:
-1. ANALYZE: Break down requirements and constraints
-2. DESIGN: Plan architecture and component interactions  
-3. IMPLEMENT: Generate production-ready code with best practices
-4. VALIDATE: Consider edge cases, security, and performance
+        estimated = (
+            sum(len(value) for value in inputs.values()) // 4
+            + _PROMPT_OVERHEAD_TOKENS
+            + _MAX_OUTPUT_TOKENS
+        )
+        await self._rate_limiter.acquire(estimated)
+        message = await llm_chain.ainvoke(inputs)
 
-QUALITY STANDARDS:
-- Complete, runnable code with all imports
-- Comprehensive error handling and logging
-- Type hints and detailed Google-style docstrings
-- Security best practices and input validation
-- Performance optimization and resource management""",
-                    ),
-                    (
-                        "user",
-                        """DEVELOPMENT TASK:
-Repository: {repo_path}
-Task: {prompt}
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            self._rate_limiter.reconcile(estimated, usage["total_tokens"])
+        return await parser.ainvoke(message)
 
-CONTEXT:
-{context}
+    async def astream_code_changes(
+        self, prompt: str, repo_path: str, context: Optional[Dict] = None
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream generated files as soon as each one is complete.
 
-REQUIREMENTS:
-Generate a complete, production-ready solution that follows best practices.
-Include detailed reasoning about your approach and design decisions.
-Consider scalability, maintainability, and security in your solution.""",
-                    ),
-                ]
-            )
+        The JSON output parser yields progressively more complete partial
+        objects while tokens arrive; a file entry is final once the next one
+        has started, and the last entry is final when the stream ends.
 
-            # Use structured output parser
-            json_parser = JsonOutputParser(pydantic_object=CodeGenerationResponse)
-            chain = template | self.llm | json_parser
+        Args:
+            prompt: Task description for the AI
+            repo_path: Path to the repository
+            context: Additional context for generation
 
-            # Prepare context
-            context_str = self._build_context(context, repo_path)
+        Yields:
+            Dict with the "name" and "content" of each generated file
+        """
+        context_str = self._build_context(context, repo_path)
+        inputs = {"prompt": prompt, "repo_path": repo_path, "context": context_str}
+
+        self.log(f"🚀 Streaming generation with GPT-5 model: {self.model}")
+
+        emitted = 0
+        result = None
+        async for partial in self._gen_chain.astream(inputs):
+            if not isinstance(partial, dict):
+                continue
+            result = partial
+            files = partial.get("files") or []
+            while emitted < len(files) - 1:
+                yield files[emitted]
+                emitted += 1
+
+        if result is None:
+            return
+        files = result.get("files") or []
+        while emitted < len(files):
+            yield files[emitted]
+            emitted += 1
+
+        self._record_generation(prompt, repo_path, context, result)
+
+    async def agenerate_code_changes_batch(
+        self,
+        items: List[Tuple[str, str, Optional[Dict]]],
+        max_concurrency: int = 10,
+        apply_changes: bool = False,
+    ) -> List[Optional[str]]:
+        """
+        Generate code changes for many prompts concurrently.
 
-            self.log(f"🚀 Generating with GPT-5 model: {self.model}")
+        Args:
+            items: (prompt, repo_path, context) tuples to generate for
+            max_concurrency: Maximum number of requests in flight at once
+            apply_changes: Write each generation's files as soon as it completes
 
-            try:
-                result = chain.invoke(
-                    {
-                        "prompt": prompt,
-                        "repo_path": repo_path,
-                        "context": context_str,
-                    }
-                )
+        Returns:
+            List of generated code changes (None for failures), in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-                # Format result for output
-                if isinstance(result, dict):
-                    formatted_result = self._format_structured_result(result)
-                else:
-                    formatted_result = str(result)
-
-                # Update state
-                generation_info = {
-                    "prompt": prompt,
-                    "repo_path": repo_path,
-                    "context": context,
-                    "result": result,
-                    "formatted_result": formatted_result,
-                    "timestamp": time.time(),
-                    "model": self.model,
-                    "success": (
-                        result.get("success", False)
-                        if isinstance(result, dict)
-                        else True
-                    ),
-                    "reasoning": (
-                        result.get("reasoning", "") if isinstance(result, dict) else ""
-                    ),
-                    "confidence": (
-                        result.get("confidence", 0.9)
-                        if isinstance(result, dict)
-                        else 0.9
-                    ),
-                }
+        async def _generate(prompt: str, repo_path: str, context: Optional[Dict]):
+            async with semaphore:
+                result = await self.agenerate_code_changes(prompt, repo_path, context)
+            if result is not None and apply_changes:
+                await self.amake_code_changes(result, repo_path)
+            return result
 
-                generated_code = self.get_state("generated_code", [])
-                generated_code.append(generation_info)
-                self.update_state("generated_code", generated_code)
+        self.log(
+            f"🚀 Generating {len(items)} requests (max concurrency: {max_concurrency})"
+        )
+        return await asyncio.gather(*(_generate(*item) for item in items))
 
-                return formatted_result
+    def generate_code_changes_batch(
+        self,
+        items: List[Tuple[str, str, Optional[Dict]]],
+        max_concurrency: int = 10,
+        apply_changes: bool = False,
+    ) -> List[Optional[str]]:
+        """
+        Synchronous entry point for concurrent batch generation.
 
-            except Exception as e:
-                self.log(f"❌ GPT-5 generation failed: {e}", "error")
-                return self._fallback_generation(prompt, repo_path, context_str)
+        Args:
+            items: (prompt, repo_path, context) tuples to generate for
+            max_concurrency: Maximum number of requests in flight at once
+            apply_changes: Write each generation's files as soon as it completes
 
-        return self.execute_with_tracking(
-            "generate_code_changes", _generation_operation
+        Returns:
+            List of generated code changes (None for failures), in input order
+        """
+        return asyncio.run(
+            self.agenerate_code_changes_batch(items, max_concurrency, apply_changes)
         )
 
+    def _record_generation(
+        self, prompt: str, repo_path: str, context: Optional[Dict], result: Any
+    ) -> str:
+        """
+        Format a generation result and record it in the generation history.
+
+        Args:
+            prompt: Task description for the AI
+            repo_path: Path to the repository
+            context: Additional context for generation
+            result: Parsed model output
+
+        Returns:
+            str: Formatted result
+        """
+        # The parser returns a plain dict; schema validation is a debug aid only
+        if self.debug and isinstance(result, dict):
+            try:
+                CodeGenerationResponse.model_validate(result)
+            except ValidationError as e:
+                self.log(f"⚠️ Response does not match schema: {e}", "debug")
+
+        # Format result for output
+        if isinstance(result, dict):
+            formatted_result = self._format_structured_result(result)
+        else:
+            formatted_result = str(result)
+
+        # Update state; the full output is returned to the caller, so history
+        # only keeps its size and digest plus the names of generated files
+        files = result.get("files", []) if isinstance(result, dict) else []
+        generation_info = {
+            "prompt": prompt,
+            "repo_path": repo_path,
+            "context": context,
+            "files": [f.get("name") for f in files if isinstance(f, dict)],
+            "result_size": len(formatted_result),
+            "result_sha256": hashlib.sha256(
+                formatted_result.encode("utf-8")
+            ).hexdigest(),
+            "timestamp": time.time(),
+            "model": self.model,
+            "success": (
+                result.get("success", False) if isinstance(result, dict) else True
+            ),
+            "reasoning": (
+                result.get("reasoning", "") if isinstance(result, dict) else ""
+            ),
+            "confidence": (
+                result.get("confidence", 0.9) if isinstance(result, dict) else 0.9
+            ),
+        }
+
+        self._generated_code.append(generation_info)
+
+        return formatted_result
+
     def _build_context(self, context: Optional[Dict], repo_path: str) -> str:
         """Build context with repository analysis."""
         context_parts = []
@@ -237,16 +1119,7 @@ Consider scalability, maintainability, and security in your solution.""",
         # Add repository context if available
         try:
             if os.path.exists(repo_path):
-                files = []
-                for root, _, filenames in os.walk(repo_path):
-                    for filename in filenames[:10]:  # Limit to first 10 files
-                        if filename.endswith(
-                            (".py", ".js", ".ts", ".java", ".go", ".rs")
-                        ):
-                            rel_path = os.path.relpath(
-                                os.path.join(root, filename), repo_path
-                            )
-                            files.append(rel_path)
+                files = _scan_repo_files(repo_path, os.stat(repo_path).st_mtime_ns)
 
                 if files:
                     context_parts.append(f"- Existing code files: {', '.join(files)}")
@@ -259,44 +1132,55 @@ Consider scalability, maintainability, and security in your solution.""",
             else "No additional context provided"
         )
 
+    def reset_context_cache(self) -> None:
+        """Forget cached repository file listings used to build context."""
+        _scan_repo_files.cache_clear()
+
     def _format_structured_result(self, result: Dict) -> str:
         """Format structured result back to expected string format."""
-        formatted_parts = []
+        # Sections are separated by a blank line; each one ends with "\n", so
+        # every section after the header starts with the separating "\n"
+        buf = io.StringIO()
 
         # Add model and confidence information
         confidence = result.get("confidence", 0.9)
-        formatted_parts.append(
+        buf.write(
             f"# GENERATED WITH GPT-5 ({self.model}) - Confidence: {confidence:.1%}\n"
         )
 
         # Add reasoning as comment
         if result.get("reasoning"):
-            reasoning_lines = result["reasoning"].split("\n")
-            formatted_reasoning = "\n# ".join(["REASONING:"] + reasoning_lines)
-            formatted_parts.append(f"# {formatted_reasoning}\n")
+            buf.write("\n# REASONING:")
+            for line in result["reasoning"].split("\n"):
+                buf.write("\n# ")
+                buf.write(line)
+            buf.write("\n")
 
         # Format file creations
         for file_info in result.get("files", []):
-            name = file_info.get("name", "unknown.py")
-            content = file_info.get("content", "")
-            formatted_parts.append(f"FILE: {name}\n```python\n{content}\n```\n")
+            buf.write(f"\nFILE: {file_info.get('name', 'unknown.py')}\n```python\n")
+            # str() keeps the old f-string behavior for None or list values
+            buf.write(str(file_info.get("content", "")))
+            buf.write("\n```\n")
 
         # Format modifications
         for mod_info in result.get("modifications", []):
-            target = mod_info.get("target", "unknown.py")
-            changes = mod_info.get("changes", "")
-            formatted_parts.append(f"MODIFY: {target}\n```\n{changes}\n```\n")
+            buf.write(f"\nMODIFY: {mod_info.get('target', 'unknown.py')}\n```\n")
+            buf.write(str(mod_info.get("changes", "")))
+            buf.write("\n```\n")
 
         # Add dependencies and next steps as comments
         if result.get("dependencies"):
-            deps = ", ".join(result["dependencies"])
-            formatted_parts.append(f"# DEPENDENCIES: {deps}\n")
+            buf.write(f"\n# DEPENDENCIES: {', '.join(result['dependencies'])}\n")
 
         if result.get("next_steps"):
-            steps = "\n# ".join(result["next_steps"])
-            formatted_parts.append(f"# NEXT STEPS:\n# {steps}\n")
+            buf.write("\n# NEXT STEPS:")
+            for step in result["next_steps"]:
+                buf.write("\n# ")
+                buf.write(step)
+            buf.write("\n")
 
-        return "\n".join(formatted_parts)
+        return buf.getvalue()
 
     def _fallback_generation(
         self, prompt: str, repo_path: str, context_str: str
@@ -304,38 +1188,7 @@ Consider scalability, maintainability, and security in your solution.""",
         """Fallback generation method using simpler approach."""
         self.log("🔄 Using fallback generation method...")
 
-        fallback_template = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are an expert Python developer using GPT-5. Generate complete, production-ready code files.
-
-OUTPUT FORMAT:
-For each file, use this EXACT format:
-
-FILE: filename.py
-```python
-# Complete file content with imports, classes, functions
-# Include proper docstrings and type hints
-```
-
-REQUIREMENTS:
-- Complete, runnable code
-- All necessary imports
-- Google-style docstrings  
-- Type hints
-- Error handling
-- Follow PEP 8""",
-                ),
-                (
-                    "user",
-                    "Repository: {repo_path}\nTask: {prompt}\nContext: {context}",
-                ),
-            ]
-        )
-
-        chain = fallback_template | self.llm | StrOutputParser()
-        return chain.invoke(
+        return self._fallback_chain.invoke(
             {
                 "prompt": prompt,
                 "repo_path": repo_path,
@@ -343,6 +1196,64 @@ REQUIREMENTS:
             }
         )
 
+    def _parse_new_files(self, generated_code: str) -> List[Tuple[str, str]]:
+        """
+        Parse FILE: directives and their code blocks out of generated text.
+
+        Args:
+            generated_code: Generated code string with FILE: and MODIFY: directives
+
+        Returns:
+            List of (relative file path, content) tuples, in output order
+        """
+        new_files = []
+        current_file = None
+        current_content = []
+        in_code_block = False
+        pos = 0
+
+        for match in _DIRECTIVE_RE.finditer(generated_code):
+            if in_code_block and current_file:
+                block = _lines_between(generated_code, pos, match.start())
+                if block is not None:
+                    current_content.append(block)
+            pos = match.end()
+            kind = match.group("kind")
+
+            if kind == "FILE":
+                # Save previous file if exists
+                if current_file and current_content:
+                    new_files.append((current_file, "\n".join(current_content)))
+
+                # Start new file
+                current_file = match.group("name").strip()
+                current_content = []
+                in_code_block = False
+
+            elif kind == "MODIFY":
+                # Handle file modifications
+                target_file = match.group("name").strip()
+                self.log(f"🔧 Modification needed for: {target_file}")
+
+            else:
+                in_code_block = not in_code_block
+                if not in_code_block and current_file:
+                    # End of code block, save file
+                    new_files.append((current_file, "\n".join(current_content)))
+                    current_file = None
+                    current_content = []
+
+        if in_code_block and current_file:
+            block = _lines_between(generated_code, pos, None)
+            if block is not None:
+                current_content.append(block)
+
+        # Handle last file if exists
+        if current_file and current_content:
+            new_files.append((current_file, "\n".join(current_content)))
+
+        return new_files
+
     def make_code_changes(self, generated_code: str, repo_path: str) -> bool:
         """
         Apply generated code changes to the repository.
@@ -358,56 +1269,68 @@ REQUIREMENTS:
             self.log("📝 Applying generated code changes...")
             success = True
 
-            # Parse the generated code for FILE: and MODIFY: directives
-            lines = generated_code.split("\n")
-            current_file = None
-            current_content = []
-            in_code_block = False
-
-            for line in lines:
-                if line.startswith("FILE: "):
-                    # Save previous file if exists
-                    if current_file and current_content:
+            # Group files by parent directory so each directory is created and
+            # resolved once, then create its files relative to one open dir fd
+            by_dir: Dict[str, List[Tuple[str, str]]] = {}
+            for file_path, content in self._parse_new_files(generated_code):
+                parent = os.path.dirname(os.path.join(repo_path, file_path))
+                by_dir.setdefault(parent, []).append((file_path, content))
+
+            created_dirs = set()
+            for parent, files in by_dir.items():
+                dir_fd = _open_dir_fd(parent)
+                try:
+                    for file_path, content in files:
                         success &= self._write_new_file(
-                            repo_path, current_file, "\n".join(current_content)
+                            repo_path, file_path, content, created_dirs, dir_fd
                         )
+                finally:
+                    if dir_fd is not None:
+                        os.close(dir_fd)
 
-                    # Start new file
-                    current_file = line[6:].strip()
-                    current_content = []
-                    in_code_block = False
+            return success
 
-                elif line.startswith("MODIFY: "):
-                    # Handle file modifications
-                    target_file = line[8:].strip()
-                    self.log(f"🔧 Modification needed for: {target_file}")
+        except Exception as e:
+            self.log(f"❌ Failed to apply code changes: {e}", "error")
+            return False
 
-                elif line.startswith("```"):
-                    in_code_block = not in_code_block
-                    if not in_code_block and current_file:
-                        # End of code block, save file
-                        success &= self._write_new_file(
-                            repo_path, current_file, "\n".join(current_content)
-                        )
-                        current_file = None
-                        current_content = []
+    async def amake_code_changes(self, generated_code: str, repo_path: str) -> bool:
+        """
+        Async variant of make_code_changes that writes all files concurrently.
 
-                elif in_code_block and current_file:
-                    current_content.append(line)
+        Args:
+            generated_code: Generated code string with FILE: and MODIFY: directives
+            repo_path: Repository path
 
-            # Handle last file if exists
-            if current_file and current_content:
-                success &= self._write_new_file(
-                    repo_path, current_file, "\n".join(current_content)
-                )
+        Returns:
+            bool: True if changes were applied successfully
+        """
+        try:
+            self.log("📝 Applying generated code changes...")
 
-            return success
+            # Last write wins, as in the sequential path, without racing writers
+            new_files = dict(self._parse_new_files(generated_code))
+            created_dirs = set()
+            results = await asyncio.gather(
+                *(
+                    self._awrite_new_file(repo_path, file_path, content, created_dirs)
+                    for file_path, content in new_files.items()
+                )
+            )
+            return all(results)
 
         except Exception as e:
             self.log(f"❌ Failed to apply code changes: {e}", "error")
             return False
 
-    def _write_new_file(self, repo_path: str, file_path: str, content: str) -> bool:
+    def _write_new_file(
+        self,
+        repo_path: str,
+        file_path: str,
+        content: str,
+        created_dirs: Optional[Set[str]] = None,
+        dir_fd: Optional[int] = None,
+    ) -> bool:
         """
         Write a new file to the repository.
 
@@ -415,6 +1338,8 @@ REQUIREMENTS:
             repo_path: Repository path
             file_path: Relative file path
             content: File content
+            created_dirs: Directories already created in this batch
+            dir_fd: Open descriptor of the file's (existing) parent directory
 
         Returns:
             bool: True if successful
@@ -422,27 +1347,69 @@ REQUIREMENTS:
         try:
             full_path = os.path.join(repo_path, file_path)
 
-            # Create directory if it doesn't exist
-            dir_path = os.path.dirname(full_path)
-            if dir_path:
-                os.makedirs(dir_path, exist_ok=True)
+            if dir_fd is not None:
+                _write_bytes(
+                    os.path.basename(full_path), content.encode("utf-8"), dir_fd
+                )
+            else:
+                # Create directory if it doesn't exist
+                _ensure_parent_dir(full_path, created_dirs)
+                _write_bytes(full_path, content.encode("utf-8"))
+
+            self._track_created_file(file_path)
+            return True
+
+        except Exception as e:
+            self.log(f"❌ Failed to write file {file_path}: {e}", "error")
+            return False
+
+    async def _awrite_new_file(
+        self,
+        repo_path: str,
+        file_path: str,
+        content: str,
+        created_dirs: Optional[Set[str]] = None,
+    ) -> bool:
+        """
+        Write a new file to the repository without blocking the event loop.
 
-            with open(full_path, "w", encoding="utf-8") as f:
-                f.write(content)
+        Args:
+            repo_path: Repository path
+            file_path: Relative file path
+            content: File content
+            created_dirs: Directories already created in this batch
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            full_path = os.path.join(repo_path, file_path)
 
-            self.log(f"✅ Created file: {file_path}")
+            # Create directory if it doesn't exist
+            _ensure_parent_dir(full_path, created_dirs)
 
-            # Track created file
-            created_files = self.get_state("created_files", [])
-            created_files.append(file_path)
-            self.update_state("created_files", created_files)
+            async with aiofiles.open(full_path, mode="w", encoding="utf-8") as f:
+                await f.write(content)
 
+            self._track_created_file(file_path)
             return True
 
         except Exception as e:
             self.log(f"❌ Failed to write file {file_path}: {e}", "error")
             return False
 
+    def _track_created_file(self, file_path: str) -> None:
+        """
+        Log and record a newly created file.
+
+        Args:
+            file_path: Relative file path
+        """
+        self.log(f"✅ Created file: {file_path}")
+
+        # Track created file
+        self._created_files.append(file_path)
+
     def _write_modified_file(
         self, full_file_path: str, original_content: str, modified_content: str
     ) -> bool:
@@ -458,14 +1425,12 @@ REQUIREMENTS:
             bool: True if successful
         """
         try:
-            with open(full_file_path, "w", encoding="utf-8") as f:
-                f.write(modified_content)
+            _write_bytes(full_file_path, modified_content.encode("utf-8"))
 
             self.log(f"✅ Modified file: {full_file_path}")
 
             # Track modified file
-            modified_files = self.get_state("modified_files", [])
-            modified_files.append(
+            self._modified_files.append(
                 {
                     "path": full_file_path,
                     "original_size": len(original_content),
@@ -473,7 +1438,6 @@ REQUIREMENTS:
                     "timestamp": time.time(),
                 }
             )
-            self.update_state("modified_files", modified_files)
 
             return True
 
@@ -492,15 +1456,25 @@ REQUIREMENTS:
             List of dictionaries with filename and content
         """
         code_blocks = []
-        lines = text.split("\n")
         current_file = None
         current_content = []
         in_code_block = False
-
-        for line in lines:
-            if line.startswith("FILE: "):
-                current_file = line[6:].strip()
-            elif line.startswith("```python") or line.startswith("```"):
+        pos = 0
+
+        for match in _DIRECTIVE_RE.finditer(text):
+            kind = match.group("kind")
+            if kind == "MODIFY":
+                # Only FILE: starts a block here; MODIFY: lines are content
+                continue
+            if in_code_block:
+                block = _lines_between(text, pos, match.start())
+                if block is not None:
+                    current_content.append(block)
+            pos = match.end()
+
+            if kind == "FILE":
+                current_file = match.group("name").strip()
+            else:
                 in_code_block = not in_code_block
                 if not in_code_block and current_file:
                     code_blocks.append(
@@ -511,8 +1485,6 @@ REQUIREMENTS:
                     )
                     current_content = []
                     current_file = None
-            elif in_code_block:
-                current_content.append(line)
 
         return code_blocks
 
@@ -529,29 +1501,36 @@ REQUIREMENTS:
         Returns:
             Dictionary with quality metrics
         """
-        lines = code.split("\n")
-        non_empty_lines = [line for line in lines if line.strip()]
+        return _analyze_code_quality(code, filename)
 
-        return {
-            "filename": filename,
-            "total_lines": len(lines),
-            "non_empty_lines": len(non_empty_lines),
-            "has_docstrings": '"""' in code or "'''" in code,
-            "has_type_hints": "->" in code or ": " in code,
-            "has_imports": any(
-                line.strip().startswith(("import ", "from ")) for line in lines
-            ),
-            "complexity_estimate": len(
-                [
-                    line
-                    for line in lines
-                    if any(
-                        keyword in line
-                        for keyword in ["if ", "for ", "while ", "def ", "class "]
-                    )
-                ]
-            ),
-        }
+    def analyze_codebase(
+        self, files: List[Tuple[str, str]], workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze code quality for many files in parallel worker processes.
+
+        Small inputs, or workers=1, are analyzed inline to skip pool startup.
+
+        Args:
+            files: (filename, code) pairs to analyze
+            workers: Number of worker processes (default: CPU count)
+
+        Returns:
+            List of quality metric dictionaries, in input order
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(files) <= _ANALYSIS_CHUNKSIZE:
+            return [_analyze_code_quality_worker(file) for file in files]
+
+        self.log(f"🔍 Analyzing {len(files)} files with {workers} worker processes")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    _analyze_code_quality_worker,
+                    files,
+                    chunksize=_ANALYSIS_CHUNKSIZE,
+                )
+            )
 
     def get_generation_history(self) -> List[Dict[str, Any]]:
         """
@@ -560,7 +1539,7 @@ REQUIREMENTS:
         Returns:
             List of generation records
         """
-        return self.get_state("generated_code", [])
+        return list(self._generated_code)
 
     def get_created_files(self) -> List[str]:
         """
@@ -569,7 +1548,7 @@ REQUIREMENTS:
         Returns:
             List of created file paths
         """
-        return self.get_state("created_files", [])
+        return list(self._created_files)
 
     def get_modified_files(self) -> List[Dict[str, Any]]:
         """
@@ -578,7 +1557,7 @@ REQUIREMENTS:
         Returns:
             List of modification records
         """
-        return self.get_state("modified_files", [])
+        return list(self._modified_files)
 
     def generate_code_with_context(
         self,
@@ -651,62 +1630,21 @@ REQUIREMENTS:
 
             self.log(f"📄 Original file content ({len(existing_content)} chars)")
 
-            # Use GPT-5 for precise modification
-            modification_template = ChatPromptTemplate.from_messages(
-                [
-                    (
-                        "system",
-                        """You are a precise code editor using GPT-5's advanced capabilities.
-
-TASK: Modify code files with surgical precision while preserving all existing functionality.
-
-CRITICAL RULES:
-- Make ONLY the requested change - do not refactor, reorganize, or "improve" other code
-- Preserve ALL existing imports, comments, formatting, and structure
-- Maintain the exact same file structure and organization
-- Keep all existing functionality intact
-- If changing a value, change ONLY that specific value
-- If modifying a function, change ONLY what was requested
-
-OUTPUT: Return the complete modified file content with only the minimal necessary change applied.""",
-                    ),
-                    (
-                        "user",
-                        """MODIFICATION REQUEST: {modification_description}
-
-ORIGINAL FILE CONTENT:
-```
-{existing_content}
-```
-
-Apply the requested change with surgical precision, keeping everything else exactly the same:""",
-                    ),
-                ]
-            )
-
-            modification_chain = modification_template | self.llm | StrOutputParser()
-            modified_content = modification_chain.invoke(
-                {
-                    "existing_content": existing_content,
-                    "modification_description": modification_description,
-                }
+            # Ask GPT-5 for minimal line edits first, full-file rewrite if unusable
+            modified_content = self._modify_with_edits(
+                existing_content, modification_description
             )
-
-            # Clean up the response (remove code block markers if present)
-            modified_content = modified_content.strip()
-            if modified_content.startswith("```"):
-                lines = modified_content.split("\n")
-                if len(lines) > 2:
-                    modified_content = "\n".join(lines[1:-1])
+            if modified_content is None:
+                self.log("🔄 Falling back to full-file modification...")
+                modified_content = self._modify_full_file(
+                    existing_content, modification_description
+                )
 
             # Verify that the change isn't too drastic
-            from difflib import SequenceMatcher
+            similarity = _content_similarity(existing_content, modified_content)
 
-            similarity = SequenceMatcher(
-                None, existing_content, modified_content
-            ).ratio()
-
-            if similarity < 0.5:  # If less than 50% similar, it's probably wrong
+            # If less than 50% similar, it's probably wrong
+            if similarity < _MIN_MODIFY_SIMILARITY:
                 self.log(
                     f"❌ Modification too drastic (similarity: {similarity:.2f}), rejecting",
                     "error",
@@ -725,6 +1663,77 @@ Apply the requested change with surgical precision, keeping everything else exac
             self.log(f"❌ GPT-5 modification failed: {e}", "error")
             return None
 
+    def _modify_with_edits(
+        self, existing_content: str, modification_description: str
+    ) -> Optional[str]:
+        """
+        Modify file content by asking GPT-5 for structured line edits.
+
+        Only the changed lines are generated; the spliced result is then
+        judged like a full-file rewrite.
+
+        Args:
+            existing_content: Original file content
+            modification_description: Description of changes to make
+
+        Returns:
+            str: Modified content, or None if the edits were unusable
+        """
+        numbered_content = "".join(
+            f"{number}| {line}"
+            for number, line in enumerate(
+                existing_content.splitlines(keepends=True), 1
+            )
+        )
+        try:
+            result = self._edit_chain.invoke(
+                {
+                    "numbered_content": numbered_content,
+                    "modification_description": modification_description,
+                }
+            )
+        except Exception as e:
+            self.log(f"⚠️ Edit-mode modification failed: {e}", "warning")
+            return None
+
+        edits = result.get("edits") if isinstance(result, dict) else None
+        applied = _apply_line_edits(existing_content, edits)
+        if applied is None:
+            self.log("⚠️ Model returned invalid edits", "warning")
+            return None
+
+        modified_content, changed_lines = applied
+        self.log(f"✂️ Applied {len(edits)} edit(s) touching {changed_lines} line(s)")
+        return modified_content
+
+    def _modify_full_file(
+        self, existing_content: str, modification_description: str
+    ) -> str:
+        """
+        Modify file content by asking GPT-5 to return the whole rewritten file.
+
+        Args:
+            existing_content: Original file content
+            modification_description: Description of changes to make
+
+        Returns:
+            str: Modified file content
+        """
+        modified_content = self._modify_chain.invoke(
+            {
+                "existing_content": existing_content,
+                "modification_description": modification_description,
+            }
+        )
+
+        # Clean up the response (remove code block markers if present)
+        modified_content = modified_content.strip()
+        if modified_content.startswith("```"):
+            lines = modified_content.split("\n")
+            if len(lines) > 2:
+                modified_content = "\n".join(lines[1:-1])
+        return modified_content
+
     def get_model_info(self) -> Dict[str, any]:
         """
         Get information about the current GPT-5 model.
@@ -753,29 +1762,17 @@ Apply the requested change with surgical precision, keeping everything else exac
         Returns:
             Result of the action
         """
-        action_map = {
-            "generate": self.generate_code_changes,
-            "generate_with_context": self.generate_code_with_context,
-            "apply": self.make_code_changes,
-            "modify": self.modify_existing_file,
-            "extract": self.extract_python_code_from_text,
-            "analyze": self.analyze_code_quality,
-            "history": self.get_generation_history,
-            "files": self.get_created_files,
-            "modified_files": self.get_modified_files,
-            "model_info": self.get_model_info,
-        }
-
-        if action not in action_map:
+        method_name = self._ACTION_TO_METHOD.get(action)
+        if method_name is None:
             self.log(
-                f"❌ Unknown action: {action}. Available actions: {list(action_map.keys())}",
+                f"❌ Unknown action: {action}. Available actions: {list(self._ACTION_TO_METHOD)}",
                 "error",
             )
             return None
 
         try:
             self.log(f"🎯 Executing action: {action}")
-            result = action_map[action](**kwargs)
+            result = getattr(self, method_name)(**kwargs)
 
             if result is not None:
                 self.log(f"✅ Action {action} completed successfully")
@@ -4,15 +4,316 @@ Environment Manager Agent for Orion AI Agent System
 This agent handles virtual environment management and dependency installation.
 """
 
+import concurrent.futures
+import errno
+import functools
+import glob
+import hashlib
+import json
 import os
 import platform
+import re
+import shutil
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
-from typing import Dict, List, Optional
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..base_agent import BaseAgent
+
+# Platform facts looked up once; they never change while the agent runs
+_IS_WINDOWS = platform.system() == "Windows"
+_PY_VERSION = platform.python_version()
+
+# Threads checking environment paths at once in get_environment_summary
+_STAT_THREADS = 32
+
+# How long an environment's pip counts as current after upgrading it
+_PIP_UPGRADE_INTERVAL = 7 * 24 * 60 * 60
+
+# Long-lived pip process: imports pip once, then forks a child per command so
+# every command starts from that warm but untouched state. It answers each
+# JSON request line with the command's exit code.
+_PIP_SERVER_BOOTSTRAP = """\
+import json, os, sys
+try:
+    from pip._internal.cli.main import main
+except Exception:
+    sys.exit(1)
+print("ready", flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.chdir(request["cwd"])
+            devnull = os.open(os.devnull, os.O_RDWR)
+            os.dup2(devnull, 0)
+            if request["stdout"]:
+                flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+                os.dup2(os.open(request["stdout"], flags, 0o666), 1)
+            else:
+                os.dup2(devnull if request["quiet"] else 2, 1)
+            if request["quiet"]:
+                os.dup2(devnull, 2)
+            code = main(request["argv"])
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            code = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code or 0)
+    _, status = os.waitpid(pid, 0)
+    print(os.WEXITSTATUS(status) if os.WIFEXITED(status) else 1, flush=True)
+"""
+
+# pip commands that uv runs instead of pip when it is installed
+_UV_PIP_COMMANDS = frozenset({"install", "freeze", "list"})
+
+# A requirement pinned with == and followed by one or more --hash options
+_HASHED_REQUIREMENT = re.compile(
+    r"^[A-Za-z0-9_.\-]+(\[[^\]]*\])?==\S+(\s+--hash=\S+)+$"
+)
+
+
+def _extract_wheel(wheel: str, image_cache_dir: str) -> str:
+    """
+    Extract a wheel into the image cache, unless an earlier run already did.
+
+    Args:
+        wheel: Path to the wheel
+        image_cache_dir: Directory holding extracted wheels
+
+    Returns:
+        str: Directory holding the wheel's extracted contents
+    """
+    image_dir = os.path.join(image_cache_dir, os.path.basename(wheel)[: -len(".whl")])
+    if not os.path.isdir(image_dir):
+        os.makedirs(image_cache_dir, exist_ok=True)
+        extract_dir = tempfile.mkdtemp(dir=image_cache_dir)
+        with zipfile.ZipFile(wheel) as wheel_zip:
+            wheel_zip.extractall(extract_dir)
+        try:
+            os.rename(extract_dir, image_dir)
+        except OSError:
+            # Another process extracted the same wheel first
+            shutil.rmtree(extract_dir, ignore_errors=True)
+    return image_dir
+
+
+@functools.lru_cache(maxsize=None)
+def _pip_images(image_cache_dir: str) -> Tuple[str, ...]:
+    """
+    Extract the wheels bundled with ensurepip, once per cache directory.
+
+    These are the packages "python -m venv" installs: pip, plus setuptools
+    on Python versions whose ensurepip still ships it. They come from this
+    interpreter, which is also the one new venvs are created with.
+
+    Args:
+        image_cache_dir: Directory holding extracted pip images
+
+    Returns:
+        Tuple[str, ...]: Directories to copy into a venv's site-packages,
+        empty if this interpreter ships no pip wheel
+    """
+    try:
+        import ensurepip
+    except ImportError:
+        return ()
+
+    bundled_dir = os.path.join(os.path.dirname(ensurepip.__file__), "_bundled")
+    pip_wheels = glob.glob(os.path.join(bundled_dir, "pip-*.whl"))
+    if not pip_wheels:
+        return ()
+
+    wheels = [max(pip_wheels)]
+    setuptools_wheels = glob.glob(os.path.join(bundled_dir, "setuptools-*.whl"))
+    if setuptools_wheels:
+        wheels.append(max(setuptools_wheels))
+    return tuple(_extract_wheel(wheel, image_cache_dir) for wheel in wheels)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_requirements(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Read the requirement lines of a requirements file.
+
+    The modification time and size are part of the cache key, so an edited
+    file is parsed again.
+
+    Args:
+        path: Path to the requirements file
+        mtime_ns: Modification time of the file, in nanoseconds
+        size: Size of the file in bytes
+
+    Returns:
+        Tuple[str, ...]: Non-empty, non-comment lines, stripped
+    """
+    with open(path, "r") as f:
+        lines = f.read().splitlines()
+    # Strip each line once, then drop blanks and comments
+    return tuple(
+        stripped
+        for stripped in map(str.strip, lines)
+        if stripped and stripped[0] != "#"
+    )
+
+
+def _is_hash_locked(requirements: Sequence[str]) -> bool:
+    """
+    Check whether every requirement is pinned and hashed, like a lockfile.
+
+    Args:
+        requirements: Requirement lines, as returned by _parse_requirements
+
+    Returns:
+        bool: True if pip can install them without resolving dependencies
+    """
+    entries = []
+    pending = ""
+    for line in requirements:
+        # Join "\" continuations; hashes usually sit on their own lines
+        if line.endswith("\\"):
+            pending += line[:-1] + " "
+        else:
+            entries.append(pending + line)
+            pending = ""
+    return bool(entries) and all(_HASHED_REQUIREMENT.match(e) for e in entries)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link a file, copying it when linking is not possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _empty_trash(trash_dir: str) -> None:
+    """
+    Delete everything in a trash directory.
+
+    Entries left by processes that exited mid-delete are swept up as well.
+
+    Args:
+        trash_dir: Directory holding renamed-away environments
+    """
+    try:
+        entries = list(os.scandir(trash_dir))
+    except OSError:
+        return
+    for entry in entries:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _exists_dir(path: str) -> bool:
+    """
+    Check that a path is an existing directory with a single stat call.
+
+    Unlike os.path.exists, only "not found" errors count as missing; other
+    errors such as a permission problem are raised.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        bool: True if the path is a directory
+    """
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except OSError as e:
+        if e.errno in (errno.ENOENT, errno.ENOTDIR):
+            return False
+        raise
+
+
+def _venv_cache_key(repo_path: str) -> Optional[str]:
+    """
+    Compute the environment cache key for a repository.
+
+    Args:
+        repo_path: Path to the repository
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
+    Returns:
+        Optional[str]: Hash of requirements.txt and the Python version, or
+        None if the repository has no requirements.txt
+    """
+    try:
+        with open(os.path.join(repo_path, "requirements.txt"), "rb") as f:
+            requirements = f.read()
+    except OSError:
+        return None
+    digest = hashlib.blake2b(requirements, digest_size=16)
+    digest.update(_PY_VERSION.encode())
+    return digest.hexdigest()
+
+
+def _site_packages(venv_path: str) -> Optional[str]:
+    """
+    Find the site-packages directory of a virtual environment.
+
+    Args:
+        venv_path: Path to the virtual environment
+
+    Returns:
+        Optional[str]: Path to site-packages, or None for an unexpected layout
+    """
+    site_packages = glob.glob(
+        os.path.join(venv_path, "lib", "python*", "site-packages")
+    ) or glob.glob(os.path.join(venv_path, "Lib", "site-packages"))
+    return site_packages[0] if site_packages else None
+
+
+def _clone_tree(src: str, dst: str) -> None:
+    """
+    Copy a directory tree as cheaply as the filesystem allows.
+
+    Tries a reflink copy first (btrfs, xfs), then hard links, and copies
+    file contents only as a last resort. Symlinks are kept as symlinks.
+
+    Args:
+        src: Directory to copy
+        dst: Destination path, which must not exist yet
+    """
+    if not _IS_WINDOWS and shutil.which("cp"):
+        result = subprocess.run(
+            ["cp", "-a", "--reflink=always", src, dst],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode == 0:
+            return
+        # No copy-on-write support here; drop whatever was copied
+        shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(src, dst, symlinks=True, copy_function=_link_or_copy)
+
+
+@dataclass(slots=True)
+class EnvInfoView:
+    """
+    Snapshot of a managed environment, returned by get_environment_info.
+
+    Use dataclasses.asdict() where a plain dict is needed.
+    """
+
+    path: str
+    status: str
+    created_at: Optional[float] = None
+    python_version: Optional[str] = None
+    packages: List[str] = field(default_factory=list)
+    package_count: Optional[int] = None
+    python_executable: Optional[str] = None
+    last_install: Optional[float] = None
+    install_mode: Optional[str] = None
+    requirements_generated: Optional[float] = None
 
 
 class EnvironmentManagerAgent(BaseAgent):
@@ -26,17 +327,218 @@ class EnvironmentManagerAgent(BaseAgent):
     - Generate requirements files
     """
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, wheelhouse_dir: Optional[str] = None):
         """
         Initialize the Environment Manager Agent.
 
         Args:
             debug: Whether to enable debug mode
+            wheelhouse_dir: Directory of prebuilt wheels to prefer over the
+                package index
         """
         super().__init__("EnvironmentManager", debug)
-        self.update_state("environments", {})
+        cache_dir = os.path.expanduser(
+            os.environ.get("ORION_CACHE_DIR", "~/.cache/orion")
+        )
+        # Shared by every environment, so repeated installs reuse downloads
+        self._pip_cache_dir = os.path.join(cache_dir, "pip")
+        # Extracted pip wheels used to seed new environments
+        self._pip_image_cache_dir = os.path.join(cache_dir, "pip-image")
+        # Installed packages of prebuilt environments, keyed by _venv_cache_key
+        self._packages_cache_dir = os.path.join(cache_dir, "site-packages")
+        # Removed environments awaiting deletion, outside any working tree
+        self._trash_dir = os.path.join(cache_dir, "trash")
+        # uv installs packages in parallel and much faster than pip; pip is
+        # the fallback and still handles everything uv doesn't implement
+        self._uv = shutil.which("uv")
+        self._pip_download_options = ["--cache-dir", self._pip_cache_dir]
+        if wheelhouse_dir:
+            self._pip_download_options += [
+                "--find-links",
+                wheelhouse_dir,
+                "--prefer-binary",
+            ]
+        # Options for the install backend, pip or uv
+        if self._uv:
+            self._pip_options = ["--cache-dir", os.path.join(cache_dir, "uv")]
+            if wheelhouse_dir:
+                self._pip_options += ["--find-links", wheelhouse_dir]
+        else:
+            self._pip_options = self._pip_download_options
+        # Warm pip server per interpreter, or None where it can't be used
+        self._pip_servers: Dict[str, Optional[subprocess.Popen]] = {}
+        self._pip_server_lock = threading.Lock()
+        # Dispatch table for execute(), bound once
+        self._actions = {
+            "create_venv": self.create_virtual_environment,
+            "install_deps": self.install_dependencies,
+            "create_requirements": self.create_requirements_file,
+            "get_info": self.get_environment_info,
+            "list_packages": self.list_installed_packages,
+            "cleanup": self.cleanup_environment,
+            "summary": self.get_environment_summary,
+        }
+        # Mutated in place; the state holds these same dicts
+        self._environments: Dict[str, Dict] = {}
+        self._installed_packages: Dict[str, List[str]] = {}
+        self.update_state("environments", self._environments)
         self.update_state("current_environment", None)
-        self.update_state("installed_packages", {})
+        self.update_state("installed_packages", self._installed_packages)
+
+    def _get_pip_server(self, python_exec: str) -> Optional[subprocess.Popen]:
+        """
+        Get the warm pip server for an interpreter, starting it on first use.
+
+        Args:
+            python_exec: Python executable of the target environment
+
+        Returns:
+            Optional[subprocess.Popen]: The server, or None if this platform
+            can't fork or the interpreter's pip can't be driven this way
+        """
+        if python_exec in self._pip_servers:
+            return self._pip_servers[python_exec]
+
+        server = None
+        if hasattr(os, "fork"):
+            try:
+                server = subprocess.Popen(
+                    [python_exec, "-c", _PIP_SERVER_BOOTSTRAP],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                )
+            except OSError:
+                server = None
+            # pip's internal API is not stable; anything but a clean start
+            # means falling back to one process per command
+            if server is not None and server.stdout.readline() != "ready\n":
+                server.kill()
+                server.wait()
+                server = None
+                self.log(f"pip server unavailable for {python_exec}", "debug")
+        self._pip_servers[python_exec] = server
+        return server
+
+    def close_pip_servers(self, python_exec: Optional[str] = None) -> None:
+        """
+        Stop warm pip servers.
+
+        Args:
+            python_exec: Only stop this interpreter's server (default: all)
+        """
+        with self._pip_server_lock:
+            if python_exec is None:
+                servers = list(self._pip_servers.values())
+                self._pip_servers.clear()
+            else:
+                servers = [self._pip_servers.pop(python_exec, None)]
+        for server in servers:
+            if server is None:
+                continue
+            server.stdin.close()
+            try:
+                server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+    def _pip_call(
+        self,
+        python_exec: str,
+        args: List[str],
+        cwd: str,
+        quiet: bool = True,
+        stdout_path: Optional[str] = None,
+    ) -> None:
+        """
+        Run a pip command, through the interpreter's warm pip server if possible.
+
+        When uv is installed it runs the commands it supports instead, against
+        the same interpreter.
+
+        Args:
+            python_exec: Python executable of the target environment
+            args: pip arguments, e.g. ["install", "numpy"]
+            cwd: Working directory for the command
+            quiet: Discard pip's output instead of showing it
+            stdout_path: File receiving pip's standard output
+
+        Raises:
+            subprocess.CalledProcessError: If pip exits with a non-zero status
+        """
+        if self._uv and args[0] in _UV_PIP_COMMANDS:
+            self._run_pip_process(
+                [
+                    self._uv,
+                    "pip",
+                    args[0],
+                    "--python",
+                    python_exec,
+                    "--no-progress",
+                    *args[1:],
+                ],
+                cwd,
+                quiet,
+                stdout_path,
+            )
+            return
+
+        command = [python_exec, "-m", "pip", *args]
+        with self._pip_server_lock:
+            server = self._get_pip_server(python_exec)
+            reply = ""
+            if server is not None:
+                request = {
+                    "argv": args,
+                    "cwd": os.path.abspath(cwd),
+                    "quiet": quiet,
+                    "stdout": stdout_path and os.path.abspath(stdout_path),
+                }
+                try:
+                    server.stdin.write(json.dumps(request) + "\n")
+                    server.stdin.flush()
+                    reply = server.stdout.readline()
+                except OSError:
+                    pass
+                if not reply:
+                    # The server died; later calls start a fresh one
+                    del self._pip_servers[python_exec]
+
+        if reply:
+            returncode = int(reply)
+            if returncode:
+                raise subprocess.CalledProcessError(returncode, command)
+            return
+
+        self._run_pip_process(command, cwd, quiet, stdout_path)
+
+    def _run_pip_process(
+        self,
+        command: List[str],
+        cwd: str,
+        quiet: bool,
+        stdout_path: Optional[str],
+    ) -> None:
+        """
+        Run an installer command as its own process.
+
+        Args:
+            command: Full command line
+            cwd: Working directory for the command
+            quiet: Discard the command's output instead of showing it
+            stdout_path: File receiving the command's standard output
+
+        Raises:
+            subprocess.CalledProcessError: If the command exits with a non-zero
+                status
+        """
+        output = subprocess.DEVNULL if quiet else None
+        if stdout_path:
+            with open(stdout_path, "wb") as f:
+                subprocess.run(command, stdout=f, stderr=output, check=True, cwd=cwd)
+        else:
+            subprocess.run(command, stdout=output, stderr=output, check=True, cwd=cwd)
 
     def create_virtual_environment(
         self, repo_path: str, env_name: str = ".venv"
@@ -55,27 +557,74 @@ class EnvironmentManagerAgent(BaseAgent):
         def _create_venv_operation():
             venv_path = os.path.join(repo_path, env_name)
 
-            if os.path.exists(venv_path):
+            if _exists_dir(venv_path):
                 self.log("🔄 Virtual environment already exists, using existing one")
                 self.update_state("current_environment", venv_path)
                 return venv_path
 
-            self.log("🐍 Creating virtual environment...")
-            subprocess.run(
-                ["python", "-m", "venv", venv_path], check=True, cwd=repo_path
+            # Packages installed from the same requirements are reused. The
+            # venv itself is always created fresh, so its scripts and activate
+            # files point at this location rather than the cached one.
+            cache_key = _venv_cache_key(repo_path)
+            cached_packages = (
+                os.path.join(self._packages_cache_dir, cache_key)
+                if cache_key
+                else None
             )
+            if cached_packages and _exists_dir(cached_packages):
+                self.log("♻️ Reusing cached packages...")
+                subprocess.run(
+                    [sys.executable, "-m", "venv", "--without-pip", venv_path],
+                    check=True,
+                    cwd=repo_path,
+                )
+                site_packages = _site_packages(venv_path)
+                if site_packages is None:
+                    # Unexpected layout; build the environment from scratch
+                    shutil.rmtree(venv_path, ignore_errors=True)
+                else:
+                    os.rmdir(site_packages)
+                    _clone_tree(cached_packages, site_packages)
+                    self.update_state("current_environment", venv_path)
+                    self._environments[repo_path] = {
+                        "path": venv_path,
+                        "created_at": time.time(),
+                        "python_version": _PY_VERSION,
+                        "packages": [],
+                        "cache_key": cache_key,
+                    }
+                    self.update_state("environments", self._environments)
+                    return venv_path
+
+            self.log("🐍 Creating virtual environment...")
+            # Seeding pip from an extracted wheel skips the slow ensurepip step
+            # The venv uses this interpreter, matching _PY_VERSION and the
+            # bundled wheels the pip images come from
+            pip_images = _pip_images(self._pip_image_cache_dir)
+            if pip_images:
+                subprocess.run(
+                    [sys.executable, "-m", "venv", "--without-pip", venv_path],
+                    check=True,
+                    cwd=repo_path,
+                )
+                self._seed_pip(venv_path, pip_images)
+            else:
+                subprocess.run(
+                    [sys.executable, "-m", "venv", venv_path],
+                    check=True,
+                    cwd=repo_path,
+                )
             self.log("✅ Virtual environment created successfully")
 
             # Update state
             self.update_state("current_environment", venv_path)
-            environments = self.get_state("environments", {})
-            environments[repo_path] = {
+            self._environments[repo_path] = {
                 "path": venv_path,
                 "created_at": time.time(),
-                "python_version": platform.python_version(),
+                "python_version": _PY_VERSION,
                 "packages": [],
             }
-            self.update_state("environments", environments)
+            self.update_state("environments", self._environments)
 
             return venv_path
 
@@ -83,6 +632,59 @@ class EnvironmentManagerAgent(BaseAgent):
             "create_virtual_environment", _create_venv_operation
         )
 
+    def _seed_pip(self, venv_path: str, pip_images: Tuple[str, ...]) -> None:
+        """
+        Install pip into a venv created without it by linking in pip images.
+
+        Args:
+            venv_path: Path to the virtual environment
+            pip_images: Extracted wheels from _pip_images
+        """
+        site_packages = _site_packages(venv_path)
+        if site_packages is None:
+            # Unexpected layout; let the venv's own ensurepip handle it
+            subprocess.run(
+                [self.get_venv_python(venv_path), "-m", "ensurepip"],
+                check=True,
+                capture_output=True,
+            )
+            return
+
+        for pip_image in pip_images:
+            shutil.copytree(
+                pip_image,
+                site_packages,
+                copy_function=_link_or_copy,
+                dirs_exist_ok=True,
+            )
+
+    def _store_packages_in_cache(self, venv_path: str, cache_key: str) -> None:
+        """
+        Save a freshly installed environment's packages to the package cache.
+
+        Only site-packages is kept; scripts elsewhere in the venv embed its
+        absolute path and would be wrong anywhere else.
+
+        Args:
+            venv_path: Path to the virtual environment
+            cache_key: Key from _venv_cache_key
+        """
+        cached_packages = os.path.join(self._packages_cache_dir, cache_key)
+        site_packages = _site_packages(venv_path)
+        if site_packages is None or _exists_dir(cached_packages):
+            return
+
+        os.makedirs(self._packages_cache_dir, exist_ok=True)
+        staging = f"{cached_packages}.tmp-{uuid.uuid4().hex}"
+        try:
+            _clone_tree(site_packages, staging)
+            os.rename(staging, cached_packages)
+        except OSError as e:
+            # Another agent cached the same environment first, or the copy
+            # failed; either way the installed environment is still fine
+            shutil.rmtree(staging, ignore_errors=True)
+            self.log(f"Environment not cached: {e}", "debug")
+
     def get_venv_python(self, venv_path: str) -> str:
         """
         Get the path to the Python executable in the virtual environment.
@@ -93,13 +695,16 @@ class EnvironmentManagerAgent(BaseAgent):
         Returns:
             str: Path to the Python executable
         """
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             return os.path.join(venv_path, "Scripts", "python.exe")
         else:
             return os.path.join(venv_path, "bin", "python")
 
     def install_dependencies(
-        self, repo_path: str, venv_python: Optional[str] = None
+        self,
+        repo_path: str,
+        venv_python: Optional[str] = None,
+        upgrade_pip: bool = False,
     ) -> bool:
         """
         Install dependencies from requirements.txt or detect and install common ones.
@@ -107,6 +712,9 @@ class EnvironmentManagerAgent(BaseAgent):
         Args:
             repo_path: Path to the repository
             venv_python: Path to the virtual environment Python executable
+            upgrade_pip: Upgrade pip before installing, unless this agent
+                already did so for the environment recently; new environments
+                are seeded with the interpreter's bundled pip
 
         Returns:
             bool: True if installation was successful
@@ -123,67 +731,125 @@ class EnvironmentManagerAgent(BaseAgent):
             else:
                 python_exec = venv_python
 
-            # First, upgrade pip
-            self.log("📦 Upgrading pip...")
-            subprocess.run(
-                [python_exec, "-m", "pip", "install", "--upgrade", "pip"],
-                check=True,
-                cwd=repo_path,
-                capture_output=True,
-            )
+            env_info = self._environments.get(repo_path)
+            pip_upgraded_at = env_info.get("pip_upgraded_at") if env_info else None
+
+            if (
+                upgrade_pip
+                and pip_upgraded_at is not None
+                and time.time() - pip_upgraded_at < _PIP_UPGRADE_INTERVAL
+            ):
+                self.log("📦 pip was upgraded recently, skipping upgrade", "debug")
+            elif upgrade_pip:
+                self.log("📦 Upgrading pip...")
+                self._pip_call(
+                    python_exec,
+                    ["install", *self._pip_options, "--upgrade", "pip"],
+                    repo_path,
+                )
+                # The server still runs the old pip
+                self.close_pip_servers(python_exec)
+                pip_upgraded_at = time.time()
+                if env_info is not None:
+                    env_info["pip_upgraded_at"] = pip_upgraded_at
 
             # Check for requirements.txt
             requirements_file = os.path.join(repo_path, "requirements.txt")
             installed_packages = []
 
+            cache_key = _venv_cache_key(repo_path)
+
             if os.path.exists(requirements_file):
-                self.log("📋 Installing dependencies from requirements.txt...")
-                subprocess.run(
-                    [python_exec, "-m", "pip", "install", "-r", "requirements.txt"],
-                    check=True,
-                    cwd=repo_path,
+                st = os.stat(requirements_file)
+                requirements = _parse_requirements(
+                    requirements_file, st.st_mtime_ns, st.st_size
                 )
-                self.log("✅ Dependencies installed from requirements.txt")
-
-                # Read requirements to track installed packages
-                with open(requirements_file, "r") as f:
-                    installed_packages = [
-                        line.strip()
-                        for line in f
-                        if line.strip() and not line.startswith("#")
-                    ]
+                # A cloned cached environment already has everything; a fully
+                # pinned and hashed file needs no dependency resolution
+                if (
+                    env_info is not None
+                    and cache_key is not None
+                    and env_info.get("cache_key") == cache_key
+                ):
+                    install_mode = "cached"
+                    lock_options = []
+                elif _is_hash_locked(requirements):
+                    install_mode = "locked"
+                    lock_options = ["--no-deps", "--require-hashes"]
+                else:
+                    install_mode = "resolve"
+                    lock_options = []
+
+                if install_mode == "cached":
+                    self.log("✅ Dependencies already present in cached environment")
+                else:
+                    self.log("📋 Installing dependencies from requirements.txt...")
+                    self._pip_call(
+                        python_exec,
+                        [
+                            "install",
+                            *self._pip_options,
+                            *lock_options,
+                            "-r",
+                            "requirements.txt",
+                        ],
+                        repo_path,
+                        quiet=False,
+                    )
+                    self.log("✅ Dependencies installed from requirements.txt")
+
+                    # Only cache an environment this agent created and that
+                    # holds nothing but the requirements
+                    venv_path = env_info.get("path") if env_info else None
+                    if (
+                        venv_path
+                        and cache_key is not None
+                        and pip_upgraded_at is None
+                        and python_exec == self.get_venv_python(venv_path)
+                    ):
+                        self._store_packages_in_cache(venv_path, cache_key)
+                        env_info["cache_key"] = cache_key
+
+                # Track the requirements as the installed packages
+                installed_packages = list(requirements)
             else:
+                install_mode = "common"
                 # If no requirements.txt, install common dependencies for AI/ML projects
                 self.log(
                     "📦 No requirements.txt found, installing common dependencies..."
                 )
                 common_deps = ["torch", "transformers", "pillow", "numpy", "requests"]
 
-                for dep in common_deps:
-                    try:
-                        self.log(f"  Installing {dep}...")
-                        subprocess.run(
-                            [python_exec, "-m", "pip", "install", dep],
-                            check=True,
-                            cwd=repo_path,
-                            capture_output=True,
-                        )
-                        installed_packages.append(dep)
-                    except subprocess.CalledProcessError:
-                        self.log(f"  ⚠️ Failed to install {dep}, skipping...", "warning")
+                # One pip run resolves and downloads everything together
+                try:
+                    self.log(f"  Installing {', '.join(common_deps)}...")
+                    self._pip_call(
+                        python_exec,
+                        ["install", *self._pip_options, *common_deps],
+                        repo_path,
+                    )
+                    installed_packages = list(common_deps)
+                except subprocess.CalledProcessError:
+                    # Install one at a time to find out which packages fail
+                    self.log(
+                        "  ⚠️ Batch install failed, installing packages one by one...",
+                        "warning",
+                    )
+                    installed_packages = self._install_individually(
+                        python_exec, repo_path, common_deps
+                    )
 
                 self.log("✅ Common dependencies installed")
 
             # Update state
-            environments = self.get_state("environments", {})
-            if repo_path in environments:
-                environments[repo_path]["packages"] = installed_packages
-                environments[repo_path]["last_install"] = time.time()
-                self.update_state("environments", environments)
+            if env_info is not None:
+                env_info["packages"] = installed_packages
+                env_info["last_install"] = time.time()
+                env_info["install_mode"] = install_mode
+                self.update_state("environments", self._environments)
 
-            installed_packages_state = self.get_state("installed_packages", {})
-            installed_packages_state[repo_path] = installed_packages
-            self.update_state("installed_packages", installed_packages_state)
+            self._installed_packages[repo_path] = installed_packages
+            self.update_state("installed_packages", self._installed_packages)
 
             return True
 
@@ -192,6 +858,81 @@ class EnvironmentManagerAgent(BaseAgent):
             is not None
         )
 
+    def _install_individually(
+        self, python_exec: str, repo_path: str, packages: List[str]
+    ) -> List[str]:
+        """
+        Install packages one by one, skipping the ones that fail.
+
+        Downloads run concurrently, each into its own directory; the installs
+        then run one at a time from those local files, so concurrent pip
+        processes never write to the environment at once.
+
+        Args:
+            python_exec: Python executable of the target environment
+            repo_path: Path to the repository
+            packages: Packages to install
+
+        Returns:
+            List[str]: The packages that were installed, in the given order
+        """
+        installed_packages = []
+        with tempfile.TemporaryDirectory() as download_dir:
+            dest_dirs = {dep: os.path.join(download_dir, dep) for dep in packages}
+            downloaded = set()
+            # Separate processes rather than the pip server, which runs one
+            # command at a time
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(packages)
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        subprocess.run,
+                        [
+                            python_exec,
+                            "-m",
+                            "pip",
+                            "download",
+                            *self._pip_download_options,
+                            "-d",
+                            dest,
+                            dep,
+                        ],
+                        check=True,
+                        cwd=repo_path,
+                        capture_output=True,
+                    ): dep
+                    for dep, dest in dest_dirs.items()
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    dep = futures[future]
+                    try:
+                        future.result()
+                        downloaded.add(dep)
+                    except subprocess.CalledProcessError:
+                        self.log(
+                            f"  ⚠️ Failed to download {dep}, skipping...", "warning"
+                        )
+
+            find_links = [
+                arg for dest in dest_dirs.values() for arg in ("--find-links", dest)
+            ]
+            for dep in packages:
+                if dep not in downloaded:
+                    continue
+                try:
+                    self.log(f"  Installing {dep}...")
+                    self._pip_call(
+                        python_exec,
+                        ["install", "--no-index", *self._pip_options, *find_links, dep],
+                        repo_path,
+                    )
+                    installed_packages.append(dep)
+                except subprocess.CalledProcessError:
+                    self.log(f"  ⚠️ Failed to install {dep}, skipping...", "warning")
+
+        return installed_packages
+
     def create_requirements_file(
         self, repo_path: str, venv_python: Optional[str] = None
     ) -> bool:
@@ -218,29 +959,30 @@ class EnvironmentManagerAgent(BaseAgent):
                 python_exec = venv_python
 
             self.log("📝 Generating requirements.txt...")
-            result = subprocess.run(
-                [python_exec, "-m", "pip", "freeze"],
-                capture_output=True,
-                text=True,
-                check=True,
-                cwd=repo_path,
-            )
-
             requirements_path = os.path.join(repo_path, "requirements.txt")
-            with open(requirements_path, "w") as f:
-                f.write(result.stdout)
+            # pip writes straight to a file that only replaces requirements.txt
+            # once the freeze succeeded
+            partial_path = requirements_path + ".tmp"
+            try:
+                self._pip_call(
+                    python_exec, ["freeze"], repo_path, stdout_path=partial_path
+                )
+                with open(partial_path, "rb") as f:
+                    package_count = sum(1 for line in f if line.strip())
+                os.replace(partial_path, requirements_path)
+            except BaseException:
+                if os.path.exists(partial_path):
+                    os.unlink(partial_path)
+                raise
 
             self.log("✅ requirements.txt created/updated")
 
             # Update state
-            package_count = (
-                len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
-            )
-            environments = self.get_state("environments", {})
-            if repo_path in environments:
-                environments[repo_path]["requirements_generated"] = time.time()
-                environments[repo_path]["package_count"] = package_count
-                self.update_state("environments", environments)
+            env_info = self._environments.get(repo_path)
+            if env_info is not None:
+                env_info["requirements_generated"] = time.time()
+                env_info["package_count"] = package_count
+                self.update_state("environments", self._environments)
 
             return True
 
@@ -251,7 +993,7 @@ class EnvironmentManagerAgent(BaseAgent):
             is not None
         )
 
-    def get_environment_info(self, repo_path: str) -> Optional[Dict]:
+    def get_environment_info(self, repo_path: str) -> Optional[EnvInfoView]:
         """
         Get information about the environment for a specific repository.
 
@@ -259,23 +1001,27 @@ class EnvironmentManagerAgent(BaseAgent):
             repo_path: Path to the repository
 
         Returns:
-            Dict: Environment information, or None if not found
+            EnvInfoView: Environment information, or None if not found
         """
-        environments = self.get_state("environments", {})
-        if repo_path in environments:
-            env_info = environments[repo_path].copy()
-
-            # Add current status
-            venv_path = env_info.get("path")
-            if venv_path and os.path.exists(venv_path):
-                env_info["status"] = "active"
-                env_info["python_executable"] = self.get_venv_python(venv_path)
-            else:
-                env_info["status"] = "missing"
-
-            return env_info
+        env_info = self._environments.get(repo_path)
+        if env_info is None:
+            return None
 
-        return None
+        # Add current status
+        venv_path = env_info.get("path")
+        is_active = bool(venv_path) and _exists_dir(venv_path)
+        return EnvInfoView(
+            path=venv_path,
+            status="active" if is_active else "missing",
+            created_at=env_info.get("created_at"),
+            python_version=env_info.get("python_version"),
+            packages=env_info.get("packages", []),
+            package_count=env_info.get("package_count"),
+            python_executable=self.get_venv_python(venv_path) if is_active else None,
+            last_install=env_info.get("last_install"),
+            install_mode=env_info.get("install_mode"),
+            requirements_generated=env_info.get("requirements_generated"),
+        )
 
     def list_installed_packages(
         self, repo_path: str, venv_python: Optional[str] = None
@@ -302,16 +1048,22 @@ class EnvironmentManagerAgent(BaseAgent):
             else:
                 python_exec = venv_python
 
-            result = subprocess.run(
-                [python_exec, "-m", "pip", "list", "--format=freeze"],
-                capture_output=True,
-                text=True,
-                check=True,
-                cwd=repo_path,
-            )
+            fd, list_path = tempfile.mkstemp(suffix=".txt")
+            os.close(fd)
+            try:
+                self._pip_call(
+                    python_exec,
+                    ["list", "--format=freeze"],
+                    repo_path,
+                    stdout_path=list_path,
+                )
+                with open(list_path, "r") as f:
+                    output = f.read()
+            finally:
+                os.unlink(list_path)
 
             packages = []
-            for line in result.stdout.strip().split("\n"):
+            for line in output.strip().split("\n"):
                 if line.strip():
                     packages.append(line.strip())
 
@@ -321,6 +1073,28 @@ class EnvironmentManagerAgent(BaseAgent):
             "list_installed_packages", _list_packages_operation
         )
 
+    def _discard_venv(self, venv_path: str) -> None:
+        """
+        Remove a virtual environment, deleting its files in the background.
+
+        The venv is renamed into the cache's trash directory, which takes it
+        out of the repository at once. Anything the background delete
+        doesn't finish before the process exits is removed by the next one.
+
+        Args:
+            venv_path: Path to the virtual environment
+        """
+        try:
+            os.makedirs(self._trash_dir, exist_ok=True)
+            os.rename(venv_path, os.path.join(self._trash_dir, uuid.uuid4().hex))
+        except OSError:
+            # The cache is on another filesystem, so delete in place
+            shutil.rmtree(venv_path, ignore_errors=True)
+            return
+        threading.Thread(
+            target=_empty_trash, args=(self._trash_dir,), daemon=True
+        ).start()
+
     def cleanup_environment(self, repo_path: str) -> bool:
         """
         Clean up the virtual environment for a repository.
@@ -333,28 +1107,24 @@ class EnvironmentManagerAgent(BaseAgent):
         """
 
         def _cleanup_operation():
-            environments = self.get_state("environments", {})
-            if repo_path not in environments:
+            if repo_path not in self._environments:
                 self.log(f"No environment found for {repo_path}", "warning")
                 return False
 
-            env_info = environments[repo_path]
+            env_info = self._environments[repo_path]
             venv_path = env_info.get("path")
 
-            if venv_path and os.path.exists(venv_path):
-                import shutil
-
-                shutil.rmtree(venv_path)
+            if venv_path and _exists_dir(venv_path):
+                self.close_pip_servers(self.get_venv_python(venv_path))
+                self._discard_venv(venv_path)
                 self.log(f"🗑️ Removed virtual environment: {venv_path}")
 
             # Remove from state
-            del environments[repo_path]
-            self.update_state("environments", environments)
+            del self._environments[repo_path]
+            self.update_state("environments", self._environments)
 
-            installed_packages = self.get_state("installed_packages", {})
-            if repo_path in installed_packages:
-                del installed_packages[repo_path]
-                self.update_state("installed_packages", installed_packages)
+            if self._installed_packages.pop(repo_path, None) is not None:
+                self.update_state("installed_packages", self._installed_packages)
 
             return True
 
@@ -370,18 +1140,28 @@ class EnvironmentManagerAgent(BaseAgent):
         Returns:
             Dict: Summary of environments
         """
-        environments = self.get_state("environments", {})
+        environments = self._environments
 
         summary = {
             "total_environments": len(environments),
             "active_environments": 0,
             "total_packages": 0,
+            "pip_cache_dir": self._pip_cache_dir,
             "environments": [],
         }
 
-        for repo_path, env_info in environments.items():
-            venv_path = env_info.get("path")
-            is_active = venv_path and os.path.exists(venv_path)
+        # Path checks are independent, so slow filesystem stats can overlap
+        paths = [env_info.get("path") for env_info in environments.values()]
+        existence = []
+        if paths:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(_STAT_THREADS, len(paths))
+            ) as executor:
+                existence = list(
+                    executor.map(lambda path: bool(path) and _exists_dir(path), paths)
+                )
+
+        for (repo_path, env_info), is_active in zip(environments.items(), existence):
 
             if is_active:
                 summary["active_environments"] += 1
@@ -411,22 +1191,13 @@ class EnvironmentManagerAgent(BaseAgent):
         Returns:
             Result of the action
         """
-        action_map = {
-            "create_venv": self.create_virtual_environment,
-            "install_deps": self.install_dependencies,
-            "create_requirements": self.create_requirements_file,
-            "get_info": self.get_environment_info,
-            "list_packages": self.list_installed_packages,
-            "cleanup": self.cleanup_environment,
-            "summary": self.get_environment_summary,
-        }
-
-        if action not in action_map:
+        handler = self._actions.get(action)
+        if handler is None:
             self.log(f"Unknown action: {action}", "error")
             return None
 
         try:
-            return action_map[action](**kwargs)
+            return handler(**kwargs)
         except Exception as e:
             self.log(f"Error executing action {action}: {e}", "error")
             return None
@@ -4,15 +4,88 @@ Git Operations Agent for Orion AI Agent System
 This agent handles all git-related operations including cloning, branching, and repository management.
 """
 
+import asyncio
+import concurrent.futures
+import hashlib
 import os
 import shutil
 import subprocess
-import sys
+import threading
 import time
-from typing import Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    import pygit2
+except ImportError:  # Local operations fall back to the git command line
+    pygit2 = None
+
+from ..base_agent import BaseAgent
+
+# Operations execute_many runs at once; git is mostly waiting on the network
+# or the disk, but too many at once thrash both
+_GIT_WORKERS = max(4, 3 * (os.cpu_count() or 1) // 4)
+
+# Environment overrides for every git command: fail instead of prompting
+# for credentials or confirmation, and let read-only commands such as
+# status skip taking the index lock
+_GIT_ENV_OVERRIDES = {
+    "GIT_TERMINAL_PROMPT": "0",
+    "GIT_OPTIONAL_LOCKS": "0",
+    "GIT_ASK_YESNO": "false",
+}
+
+# Written into each cloned repository's config: agent checkouts are
+# short-lived, so background gc, reflogs and commit-graph writes are waste
+_TRANSIENT_REPO_CONFIG = (
+    "--config",
+    "gc.auto=0",
+    "--config",
+    "core.logAllRefUpdates=false",
+    "--config",
+    "fetch.writeCommitGraph=false",
+)
+
+# git processes the async operations run at once; the remote, not this
+# machine, is the bottleneck
+_ASYNC_GIT_LIMIT = max(3, 3 * (os.cpu_count() or 1) // 4)
+
+# Push flags for agent branches: one all-or-nothing ref update, no local
+# pre-push hooks, and no overwriting of commits pushed by someone else
+_PUSH_COMMAND = (
+    "git",
+    "-c",
+    "push.followTags=false",
+    "push",
+    "--atomic",
+    "--no-verify",
+    "--force-with-lease",
+    "origin",
+)
+
+
+def _git_env() -> Dict[str, str]:
+    """Build the environment for a git command from the current environment."""
+    return {**os.environ, **_GIT_ENV_OVERRIDES}
+
+
+def _discard_tree(path: str) -> None:
+    """
+    Move a directory out of the way and delete it in the background.
+
+    The rename is atomic, so the path is free as soon as this returns. A tree
+    left behind when the process exits is only a stray sibling directory.
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
+    Args:
+        path: Directory to remove
+    """
+    doomed = f"{path}.rm.{os.getpid()}.{time.time_ns()}"
+    os.rename(path, doomed)
+    threading.Thread(
+        target=shutil.rmtree,
+        args=(doomed,),
+        kwargs={"ignore_errors": True},
+        daemon=True,
+    ).start()
 
 
 class GitOperationsAgent(BaseAgent):
@@ -33,64 +106,384 @@ class GitOperationsAgent(BaseAgent):
             debug: Whether to enable debug mode
         """
         super().__init__("GitOperations", debug)
+        # Open libgit2 repositories by path, for in-process local operations
+        self._repos: Dict[str, "pygit2.Repository"] = {}
+        # Branch names by repository path, tagged with the generation they
+        # were read at; bumping a repository's generation invalidates them
+        self._branch_cache: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+        self._branch_cache_gen: Dict[str, int] = {}
+        # execute_many's worker pool, created on first use, and the locks
+        # that keep its workers from touching one working tree at once
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._repo_locks_lock = threading.Lock()
+        # Bounds the async operations' git processes, per event loop
+        self._git_semaphore: Optional[asyncio.Semaphore] = None
+        self._git_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Opt-in directory of bare mirrors that new clones borrow objects
+        # from, for hosts that clone the same repositories again and again
+        ref_cache_dir = os.environ.get("ORION_GIT_REF_CACHE")
+        self._ref_cache_dir = (
+            os.path.expanduser(ref_cache_dir) if ref_cache_dir else None
+        )
+        # Mirrors being created or fetched in the background
+        self._ref_refreshing: Set[str] = set()
+        self._ref_refreshing_lock = threading.Lock()
+        # execute's dispatch table, bound once
+        self._action_map: Dict[str, Callable[..., Any]] = {
+            "clone": self.clone_repository,
+            "create_branch": self.create_unique_branch,
+            "switch_branch": self.create_and_switch_branch,
+            "commit": self.commit_changes,
+            "push": self.push_branch,
+            "status": self.get_repository_status,
+        }
         self.update_state("repositories", {})
         self.update_state("current_repo", None)
         self.update_state("current_branch", None)
 
+    def _open_repo(self, repo_path: str) -> Optional["pygit2.Repository"]:
+        """
+        Get the libgit2 handle for a repository, opening it on first use.
+
+        Args:
+            repo_path: Path to the git repository
+
+        Returns:
+            Optional[pygit2.Repository]: The repository, or None if pygit2 is
+            not installed or can't open it
+        """
+        if pygit2 is None:
+            return None
+        repo = self._repos.get(repo_path)
+        if repo is None:
+            try:
+                repo = pygit2.Repository(repo_path)
+            except pygit2.GitError:
+                return None
+            self._repos[repo_path] = repo
+        return repo
+
+    def _forget_repo(self, repo_path: str) -> None:
+        """Drop the cached libgit2 handle of a repository that is replaced."""
+        self._repos.pop(repo_path, None)
+        self._invalidate_branches(repo_path)
+
+    def _invalidate_branches(self, repo_path: str) -> None:
+        """Mark the cached branch names of a repository as stale."""
+        generation = self._branch_cache_gen.get(repo_path, 0)
+        self._branch_cache_gen[repo_path] = generation + 1
+
     def clone_repository(
-        self, repo_url: str, clone_path: str, target_branch: Optional[str] = None
+        self,
+        repo_url: str,
+        clone_path: str,
+        target_branch: Optional[str] = None,
+        shallow: bool = True,
+        depth: Optional[int] = 1,
+        filter_spec: Optional[str] = "blob:none",
+        single_branch: bool = False,
+        no_tags: bool = True,
     ) -> bool:
         """
         Clone a GitHub repository to the specified path.
 
+        By default only the tip commit of each branch is fetched, file
+        contents are downloaded on demand and tags are skipped.
+
         Args:
             repo_url: GitHub repository URL
             clone_path: Path where to clone the repository
             target_branch: Specific branch to clone (optional)
+            shallow: Set to False for a full clone with complete history,
+                ignoring depth and filter_spec
+            depth: Number of commits of history to fetch (None for all)
+            filter_spec: Partial clone filter, e.g. "blob:none" (None for
+                no filter)
+            single_branch: Fetch only the cloned branch; other branches then
+                aren't known when picking a unique branch name
+            no_tags: Skip fetching tags
 
         Returns:
             bool: True if successful, False otherwise
         """
+        clone_options = self._clone_options(
+            shallow, depth, filter_spec, single_branch, no_tags
+        )
 
         def _clone_operation():
+            self._forget_repo(clone_path)
             if os.path.exists(clone_path):
                 self.log(f"Repository already exists at {clone_path}")
                 return self._handle_existing_repository(
-                    clone_path, repo_url, target_branch
+                    clone_path, repo_url, target_branch, clone_options
                 )
 
             if target_branch:
                 self.log(
                     f"Cloning repository {repo_url} (branch: {target_branch}) to {clone_path}"
                 )
-                subprocess.run(
-                    ["git", "clone", "-b", target_branch, repo_url, clone_path],
-                    check=True,
-                )
             else:
                 self.log(f"Cloning repository {repo_url} to {clone_path}")
-                subprocess.run(["git", "clone", repo_url, clone_path], check=True)
+            subprocess.run(
+                self._clone_command(
+                    repo_url,
+                    clone_path,
+                    target_branch,
+                    clone_options + self._reference_options(repo_url),
+                ),
+                check=True,
+                env=_git_env(),
+            )
+            self._record_clone(repo_url, clone_path, target_branch)
+            return True
 
-            # Update state
-            repo_name = os.path.basename(clone_path)
-            self.update_state("current_repo", clone_path)
-            repositories = self.get_state("repositories", {})
-            repositories[repo_name] = {
-                "url": repo_url,
-                "path": clone_path,
-                "target_branch": target_branch,
-                "cloned_at": time.time(),
-            }
-            self.update_state("repositories", repositories)
+        return (
+            self.execute_with_tracking("clone_repository", _clone_operation) is not None
+        )
 
+    async def aclone_repository(
+        self,
+        repo_url: str,
+        clone_path: str,
+        target_branch: Optional[str] = None,
+        shallow: bool = True,
+        depth: Optional[int] = 1,
+        filter_spec: Optional[str] = "blob:none",
+        single_branch: bool = False,
+        no_tags: bool = True,
+    ) -> bool:
+        """
+        Clone a GitHub repository without blocking the event loop.
+
+        Takes the same arguments as clone_repository. An existing repository
+        is validated and fetched in a worker thread.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        clone_options = self._clone_options(
+            shallow, depth, filter_spec, single_branch, no_tags
+        )
+
+        async def _clone_operation():
+            self._forget_repo(clone_path)
+            if os.path.exists(clone_path):
+                self.log(f"Repository already exists at {clone_path}")
+                return await asyncio.to_thread(
+                    self._handle_existing_repository,
+                    clone_path,
+                    repo_url,
+                    target_branch,
+                    clone_options,
+                )
+
+            self.log(f"Cloning repository {repo_url} to {clone_path}")
+            await self._arun_git(
+                self._clone_command(
+                    repo_url,
+                    clone_path,
+                    target_branch,
+                    clone_options + self._reference_options(repo_url),
+                )
+            )
+            self._record_clone(repo_url, clone_path, target_branch)
             return True
 
         return (
-            self.execute_with_tracking("clone_repository", _clone_operation) is not None
+            await self.aexecute_with_tracking("aclone_repository", _clone_operation)
+            is not None
+        )
+
+    @staticmethod
+    def _clone_options(
+        shallow: bool,
+        depth: Optional[int],
+        filter_spec: Optional[str],
+        single_branch: bool,
+        no_tags: bool,
+    ) -> List[str]:
+        """
+        Translate clone_repository's arguments into git clone options.
+
+        Returns:
+            List[str]: Options for _clone_command
+        """
+        clone_options = []
+        if shallow and depth:
+            clone_options += ["--depth", str(depth)]
+        if shallow and filter_spec:
+            clone_options += ["--filter", filter_spec]
+        # --depth implies --single-branch unless told otherwise
+        clone_options.append(
+            "--single-branch" if single_branch else "--no-single-branch"
         )
+        if no_tags:
+            clone_options.append("--no-tags")
+        return clone_options
+
+    def _reference_options(self, repo_url: str) -> List[str]:
+        """
+        Get clone options that borrow objects from a local mirror of a repository.
+
+        Only a mirror that already exists is used, so a clone never waits for
+        one; a stale mirror just leaves more objects to the remote. The mirror
+        is created or brought up to date in the background for later clones.
+
+        Args:
+            repo_url: GitHub repository URL
+
+        Returns:
+            List[str]: git clone options, empty if no mirror is available
+        """
+        if not self._ref_cache_dir:
+            return []
+
+        key = hashlib.blake2b(repo_url.encode(), digest_size=16).hexdigest()
+        ref_dir = os.path.join(self._ref_cache_dir, key)
+        with self._ref_refreshing_lock:
+            if ref_dir not in self._ref_refreshing:
+                self._ref_refreshing.add(ref_dir)
+                threading.Thread(
+                    target=self._refresh_reference_mirror,
+                    args=(repo_url, ref_dir),
+                    daemon=True,
+                ).start()
+
+        # --dissociate copies the borrowed objects, so clones outlive the cache
+        if not os.path.isdir(ref_dir):
+            return []
+        return ["--reference-if-able", ref_dir, "--dissociate"]
+
+    def _refresh_reference_mirror(self, repo_url: str, ref_dir: str) -> None:
+        """
+        Create or fetch a repository's local mirror.
+
+        The mirror keeps every blob: clones borrowing from it tell the remote
+        they have everything the mirror's commits reach, so a blobless mirror
+        would leave full clones without file contents.
+
+        Args:
+            repo_url: GitHub repository URL
+            ref_dir: Directory of the mirror
+        """
+        staging_dir = None
+        try:
+            if os.path.isdir(ref_dir):
+                command = ["git", "--git-dir", ref_dir, "fetch", "--prune", "origin"]
+            else:
+                # Mirrored into a private directory and renamed into place, so
+                # clones never borrow from a half-written mirror
+                os.makedirs(self._ref_cache_dir, exist_ok=True)
+                staging_dir = f"{ref_dir}.tmp.{os.getpid()}.{threading.get_ident()}"
+                command = ["git", "clone", "--mirror", repo_url, staging_dir]
+
+            result = subprocess.run(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=_git_env(),
+            )
+            if result.returncode != 0:
+                self.log(
+                    f"⚠️ Could not update reference mirror for {repo_url}", "debug"
+                )
+            elif staging_dir:
+                os.rename(staging_dir, ref_dir)
+        except OSError as e:
+            self.log(f"⚠️ Could not update reference mirror: {e}", "debug")
+        finally:
+            if staging_dir:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+            with self._ref_refreshing_lock:
+                self._ref_refreshing.discard(ref_dir)
+
+    def _record_clone(
+        self, repo_url: str, clone_path: str, target_branch: Optional[str]
+    ) -> None:
+        """Record a freshly cloned repository as the current one."""
+        repo_name = os.path.basename(clone_path)
+        self.update_state("current_repo", clone_path)
+        self.merge_state(
+            "repositories",
+            repo_name,
+            {
+                "url": repo_url,
+                "path": clone_path,
+                "target_branch": target_branch,
+                "cloned_at_ns": time.time_ns(),
+            },
+        )
+
+    async def _arun_git(self, command: List[str], cwd: Optional[str] = None) -> None:
+        """
+        Run a git command as an asyncio subprocess, bounded by _ASYNC_GIT_LIMIT.
+
+        Args:
+            command: Full command line
+            cwd: Working directory for the command
+
+        Raises:
+            subprocess.CalledProcessError: If git exits with a non-zero status
+        """
+        # asyncio primitives belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._git_semaphore_loop is not loop:
+            self._git_semaphore = asyncio.Semaphore(_ASYNC_GIT_LIMIT)
+            self._git_semaphore_loop = loop
+
+        async with self._git_semaphore:
+            proc = await asyncio.create_subprocess_exec(
+                *command, cwd=cwd, env=_git_env()
+            )
+            returncode = await proc.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    @staticmethod
+    def _clone_command(
+        repo_url: str,
+        clone_path: str,
+        target_branch: Optional[str],
+        clone_options: List[str],
+    ) -> List[str]:
+        """
+        Build a git clone command line.
+
+        Args:
+            repo_url: GitHub repository URL
+            clone_path: Path where to clone the repository
+            target_branch: Specific branch to clone (optional)
+            clone_options: Extra git clone options
+
+        Returns:
+            List[str]: The command
+        """
+        command = ["git", "clone", *_TRANSIENT_REPO_CONFIG, *clone_options]
+        if target_branch:
+            command += ["-b", target_branch]
+        return command + [repo_url, clone_path]
+
+    @staticmethod
+    def _push_command(target_branch: str, refs: Optional[List[str]]) -> List[str]:
+        """
+        Build a git push command line.
+
+        Args:
+            target_branch: Branch to push
+            refs: Further branches to push in the same atomic update
+
+        Returns:
+            List[str]: The command
+        """
+        return [*_PUSH_COMMAND, target_branch, *(refs or [])]
 
     def _handle_existing_repository(
-        self, clone_path: str, repo_url: str, target_branch: Optional[str] = None
+        self,
+        clone_path: str,
+        repo_url: str,
+        target_branch: Optional[str] = None,
+        clone_options: Optional[List[str]] = None,
     ) -> bool:
         """
         Handle an existing repository by validating and updating it.
@@ -99,57 +492,71 @@ class GitOperationsAgent(BaseAgent):
             clone_path: Path to the existing repository
             repo_url: Expected repository URL
             target_branch: Specific branch to switch to (optional)
+            clone_options: Extra git clone options, for when the directory
+                has to be cloned again
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            original_dir = os.getcwd()
-            os.chdir(clone_path)
-
             # Check if it's a valid git repository
-            subprocess.run(["git", "status"], check=True, capture_output=True)
+            subprocess.run(
+                ["git", "status"],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=clone_path,
+                env=_git_env(),
+            )
             self.log("✅ Using existing repository")
 
             # Fetch latest changes
             self.log("🔄 Fetching latest changes...")
-            subprocess.run(["git", "fetch", "origin"], check=True, capture_output=True)
+            subprocess.run(
+                ["git", "fetch", "origin"],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=clone_path,
+                env=_git_env(),
+            )
 
             # Switch to target branch or main/master branch
             if target_branch:
                 self.log(f"🌿 Switching to target branch: {target_branch}")
-                try:
-                    subprocess.run(
-                        ["git", "checkout", target_branch],
-                        check=True,
-                        capture_output=True,
-                    )
-                    self.update_state("current_branch", target_branch)
-                except subprocess.CalledProcessError:
+                # A missing local branch is the common case, so the fallback
+                # is driven by return codes rather than CalledProcessError
+                result = subprocess.run(
+                    ["git", "checkout", target_branch],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=clone_path,
+                    env=_git_env(),
+                )
+                if result.returncode != 0:
                     self.log(
                         f"⚠️ Could not switch to target branch {target_branch}, trying origin/{target_branch}"
                     )
-                    try:
-                        subprocess.run(
-                            [
-                                "git",
-                                "checkout",
-                                "-b",
-                                target_branch,
-                                f"origin/{target_branch}",
-                            ],
-                            check=True,
-                            capture_output=True,
-                        )
-                        self.update_state("current_branch", target_branch)
-                    except subprocess.CalledProcessError:
-                        self.log(
-                            f"❌ Could not switch to target branch {target_branch}"
-                        )
-                        raise Exception(f"Target branch {target_branch} does not exist")
+                    result = subprocess.run(
+                        [
+                            "git",
+                            "checkout",
+                            "-b",
+                            target_branch,
+                            f"origin/{target_branch}",
+                        ],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        cwd=clone_path,
+                        env=_git_env(),
+                    )
+                if result.returncode != 0:
+                    self.log(f"❌ Could not switch to target branch {target_branch}")
+                    raise Exception(f"Target branch {target_branch} does not exist")
+                self.update_state("current_branch", target_branch)
             else:
                 # Switch to main/master branch
-                self._switch_to_main_branch()
+                self._switch_to_main_branch(clone_path)
 
             # Update state
             self.update_state("current_repo", clone_path)
@@ -160,35 +567,45 @@ class GitOperationsAgent(BaseAgent):
             self.log(
                 "⚠️ Directory exists but is not a valid git repository. Removing and cloning fresh..."
             )
-            shutil.rmtree(clone_path)
-            if target_branch:
-                subprocess.run(
-                    ["git", "clone", "-b", target_branch, repo_url, clone_path],
-                    check=True,
-                )
-            else:
-                subprocess.run(["git", "clone", repo_url, clone_path], check=True)
+            # The fresh clone starts while the old tree is still being unlinked
+            _discard_tree(clone_path)
+            subprocess.run(
+                self._clone_command(
+                    repo_url, clone_path, target_branch, clone_options or []
+                ),
+                check=True,
+                env=_git_env(),
+            )
             return True
 
-        finally:
-            os.chdir(original_dir)
+    def _switch_to_main_branch(self, repo_path: str) -> None:
+        """
+        Switch to the main or master branch.
 
-    def _switch_to_main_branch(self) -> None:
-        """Switch to the main or master branch."""
-        try:
-            subprocess.run(["git", "checkout", "main"], check=True, capture_output=True)
-            self.update_state("current_branch", "main")
-        except subprocess.CalledProcessError:
-            try:
-                subprocess.run(
-                    ["git", "checkout", "master"], check=True, capture_output=True
-                )
-                self.update_state("current_branch", "master")
-            except subprocess.CalledProcessError:
-                self.log(
-                    "⚠️ Could not switch to main/master branch, staying on current branch",
-                    "warning",
-                )
+        Args:
+            repo_path: Path to the git repository
+        """
+        # The cached branch list tells which of the two exists, so at most
+        # one checkout normally runs
+        existing_branches = self._list_branches(repo_path)
+        for branch in ("main", "master"):
+            if branch not in existing_branches:
+                continue
+            result = subprocess.run(
+                ["git", "checkout", branch],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=repo_path,
+                env=_git_env(),
+            )
+            if result.returncode == 0:
+                self.update_state("current_branch", branch)
+                return
+
+        self.log(
+            "⚠️ Could not switch to main/master branch, staying on current branch",
+            "warning",
+        )
 
     def create_unique_branch(
         self, base_name: str, repo_path: Optional[str] = None
@@ -209,23 +626,7 @@ class GitOperationsAgent(BaseAgent):
             if not target_repo:
                 raise ValueError("No repository path specified and no current repo set")
 
-            # Get list of all branches
-            result = subprocess.run(
-                ["git", "branch", "-a"],
-                capture_output=True,
-                text=True,
-                check=True,
-                cwd=target_repo,
-            )
-
-            existing_branches = set()
-            for line in result.stdout.split("\n"):
-                line = line.strip()
-                if line and not line.startswith("*"):
-                    # Remove 'remotes/origin/' prefix if present
-                    branch_name = line.replace("remotes/origin/", "").strip()
-                    if branch_name and branch_name != "HEAD":
-                        existing_branches.add(branch_name)
+            existing_branches = self._list_branches(target_repo)
 
             # Create the full branch name with orion prefix
             full_base_name = f"orion/{base_name}"
@@ -234,12 +635,16 @@ class GitOperationsAgent(BaseAgent):
             if full_base_name not in existing_branches:
                 return full_base_name
 
-            # Generate unique name with counter
-            counter = 1
-            while f"orion/{base_name}-{counter}" in existing_branches:
-                counter += 1
+            # Generate unique name with a counter past the highest one in use
+            prefix = f"{full_base_name}-"
+            used = [
+                int(branch[len(prefix) :])
+                for branch in existing_branches
+                if branch.startswith(prefix) and branch[len(prefix) :].isdecimal()
+            ]
+            counter = max(used, default=0) + 1
 
-            return f"orion/{base_name}-{counter}"
+            return f"{prefix}{counter}"
 
         branch_name = self.execute_with_tracking(
             "create_unique_branch", _create_branch_operation
@@ -251,6 +656,58 @@ class GitOperationsAgent(BaseAgent):
 
         return branch_name
 
+    def _list_branches(self, repo_path: str) -> FrozenSet[str]:
+        """
+        List local branches and origin's branches, without the remote prefix.
+
+        The result is cached until this agent changes the repository's refs.
+
+        Args:
+            repo_path: Path to the git repository
+
+        Returns:
+            FrozenSet[str]: Branch names
+        """
+        generation = self._branch_cache_gen.get(repo_path, 0)
+        cached = self._branch_cache.get(repo_path)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        existing_branches = set()
+        repo = self._open_repo(repo_path)
+        if repo is not None:
+            # References are read in-process, with no git process to spawn
+            existing_branches.update(repo.branches.local)
+            for name in repo.branches.remote:
+                if name.startswith("origin/") and name != "origin/HEAD":
+                    existing_branches.add(name[len("origin/") :])
+        else:
+            # for-each-ref prints bare ref names, with no "*" or HEAD pointer
+            # lines to filter out
+            result = subprocess.run(
+                [
+                    "git",
+                    "for-each-ref",
+                    "--format=%(refname)",
+                    "refs/heads",
+                    "refs/remotes/origin",
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=repo_path,
+                env=_git_env(),
+            )
+            for ref in result.stdout.splitlines():
+                if ref.startswith("refs/heads/"):
+                    existing_branches.add(ref[len("refs/heads/") :])
+                elif ref != "refs/remotes/origin/HEAD":
+                    existing_branches.add(ref[len("refs/remotes/origin/") :])
+
+        branches = frozenset(existing_branches)
+        self._branch_cache[repo_path] = (generation, branches)
+        return branches
+
     def create_and_switch_branch(
         self, branch_name: str, repo_path: Optional[str] = None
     ) -> bool:
@@ -270,18 +727,31 @@ class GitOperationsAgent(BaseAgent):
             if not target_repo:
                 raise ValueError("No repository path specified and no current repo set")
 
-            original_dir = os.getcwd()
-            try:
-                os.chdir(target_repo)
+            self._invalidate_branches(target_repo)
+            repo = self._open_repo(target_repo)
+            if repo is not None:
                 self.log(f"Creating and switching to branch: {branch_name}")
-                subprocess.run(["git", "checkout", "-b", branch_name], check=True)
-
-                # Update state
+                # Like "git checkout -b": the new branch starts at HEAD, so
+                # only HEAD moves and the working tree is left alone
+                if not repo.head_is_unborn:
+                    repo.branches.local.create(
+                        branch_name, repo.head.peel(pygit2.Commit)
+                    )
+                repo.set_head(f"refs/heads/{branch_name}")
                 self.update_state("current_branch", branch_name)
                 return True
 
-            finally:
-                os.chdir(original_dir)
+            self.log(f"Creating and switching to branch: {branch_name}")
+            subprocess.run(
+                ["git", "checkout", "-b", branch_name],
+                check=True,
+                cwd=target_repo,
+                env=_git_env(),
+            )
+
+            # Update state
+            self.update_state("current_branch", branch_name)
+            return True
 
         return (
             self.execute_with_tracking("create_and_switch_branch", _branch_operation)
@@ -311,39 +781,72 @@ class GitOperationsAgent(BaseAgent):
             if not target_repo:
                 raise ValueError("No repository path specified and no current repo set")
 
-            original_dir = os.getcwd()
-            try:
-                os.chdir(target_repo)
-
+            repo = self._open_repo(target_repo)
+            if repo is not None:
+                self._commit_in_process(repo, formatted_message)
+            else:
                 # Stage all changes
                 self.log("Staging all changes...")
-                subprocess.run(["git", "add", "."], check=True)
+                subprocess.run(
+                    ["git", "add", "."], check=True, cwd=target_repo, env=_git_env()
+                )
 
                 # Commit changes
                 self.log(f"Committing with message: {formatted_message}")
-                subprocess.run(["git", "commit", "-m", formatted_message], check=True)
-
-                # Update state
-                commit_info = {
-                    "message": formatted_message,
-                    "timestamp": time.time(),
-                    "branch": self.get_state("current_branch"),
-                }
-                commits = self.get_state("commits", [])
-                commits.append(commit_info)
-                self.update_state("commits", commits)
+                subprocess.run(
+                    ["git", "commit", "-m", formatted_message],
+                    check=True,
+                    cwd=target_repo,
+                    env=_git_env(),
+                )
 
-                return True
+            # Update state
+            commit_info = {
+                "message": formatted_message,
+                "timestamp_ns": time.time_ns(),
+                "branch": self.get_state("current_branch"),
+            }
+            self.append_state("commits", commit_info)
 
-            finally:
-                os.chdir(original_dir)
+            return True
 
         return (
             self.execute_with_tracking("commit_changes", _commit_operation) is not None
         )
 
+    def _commit_in_process(self, repo: "pygit2.Repository", message: str) -> None:
+        """
+        Stage everything and commit it with libgit2, like "git add . && git commit".
+
+        Args:
+            repo: Repository to commit in
+            message: Commit message
+
+        Raises:
+            ValueError: If there is nothing to commit
+        """
+        # Stage all changes, including deletions
+        self.log("Staging all changes...")
+        index = repo.index
+        index.read()
+        index.add_all()
+        index.write()
+        tree = index.write_tree()
+
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        if parents and repo[parents[0]].tree_id == tree:
+            raise ValueError("Nothing to commit, working tree clean")
+
+        # Commit changes; the signature comes from user.name/user.email
+        self.log(f"Committing with message: {message}")
+        signature = repo.default_signature
+        repo.create_commit("HEAD", signature, signature, message, tree, parents)
+
     def push_branch(
-        self, branch_name: Optional[str] = None, repo_path: Optional[str] = None
+        self,
+        branch_name: Optional[str] = None,
+        repo_path: Optional[str] = None,
+        refs: Optional[List[str]] = None,
     ) -> bool:
         """
         Push the current branch to origin.
@@ -351,6 +854,7 @@ class GitOperationsAgent(BaseAgent):
         Args:
             branch_name: Name of the branch to push (uses current branch if None)
             repo_path: Path to the git repository (uses current repo if None)
+            refs: Further branches to push in the same atomic update
 
         Returns:
             bool: True if successful, False otherwise
@@ -365,21 +869,63 @@ class GitOperationsAgent(BaseAgent):
             if not target_branch:
                 raise ValueError("No branch name specified and no current branch set")
 
-            original_dir = os.getcwd()
-            try:
-                os.chdir(target_repo)
-                self.log(f"Pushing branch: {target_branch}")
-                subprocess.run(["git", "push", "origin", target_branch], check=True)
-
-                # Update state
-                self.update_state("last_pushed_branch", target_branch)
-                return True
+            self._invalidate_branches(target_repo)
+            self.log(f"Pushing branch: {target_branch}")
+            subprocess.run(
+                self._push_command(target_branch, refs),
+                check=True,
+                cwd=target_repo,
+                env=_git_env(),
+            )
 
-            finally:
-                os.chdir(original_dir)
+            # Update state
+            self.update_state("last_pushed_branch", target_branch)
+            return True
 
         return self.execute_with_tracking("push_branch", _push_operation) is not None
 
+    async def apush_branch(
+        self,
+        branch_name: Optional[str] = None,
+        repo_path: Optional[str] = None,
+        refs: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Push a branch to origin without blocking the event loop.
+
+        Args:
+            branch_name: Name of the branch to push (uses current branch if None)
+            repo_path: Path to the git repository (uses current repo if None)
+            refs: Further branches to push in the same atomic update
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+
+        async def _push_operation():
+            target_repo = repo_path or self.get_state("current_repo")
+            target_branch = branch_name or self.get_state("current_branch")
+
+            if not target_repo:
+                raise ValueError("No repository path specified and no current repo set")
+            if not target_branch:
+                raise ValueError("No branch name specified and no current branch set")
+
+            self._invalidate_branches(target_repo)
+            self.log(f"Pushing branch: {target_branch}")
+            await self._arun_git(
+                self._push_command(target_branch, refs), target_repo
+            )
+
+            # Update state
+            self.update_state("last_pushed_branch", target_branch)
+            return True
+
+        return (
+            await self.aexecute_with_tracking("apush_branch", _push_operation)
+            is not None
+        )
+
     def get_repository_status(self, repo_path: Optional[str] = None) -> Optional[dict]:
         """
         Get the current status of the repository.
@@ -396,54 +942,88 @@ class GitOperationsAgent(BaseAgent):
             if not target_repo:
                 raise ValueError("No repository path specified and no current repo set")
 
-            original_dir = os.getcwd()
-            try:
-                os.chdir(target_repo)
+            repo = self._open_repo(target_repo)
+            if repo is not None:
+                return self._status_in_process(repo, target_repo)
+
+            # One machine-readable status, with the branch in its headers
+            status_result = subprocess.run(
+                [
+                    "git",
+                    "status",
+                    "--porcelain=v2",
+                    "--branch",
+                    "-z",
+                    "-uall",
+                    "--no-renames",
+                ],
+                capture_output=True,
+                check=True,
+                cwd=target_repo,
+                env=_git_env(),
+            )
 
-                # Get current branch
-                branch_result = subprocess.run(
-                    ["git", "branch", "--show-current"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                current_branch = branch_result.stdout.strip()
+            # Count changes in one pass over the raw records; only the branch
+            # name is ever decoded
+            current_branch = ""
+            changes = modified_files = added_files = untracked_files = 0
+            for record in status_result.stdout.split(b"\0"):
+                kind = record[:1]
+                if kind == b"#":
+                    if record.startswith(b"# branch.head "):
+                        head = record[len(b"# branch.head ") :]
+                        if head != b"(detached)":
+                            current_branch = head.decode()
+                elif kind in (b"1", b"2", b"u"):
+                    # "<kind> XY ...": X is the index state, Y the worktree's
+                    changes += 1
+                    xy = record[2:4]
+                    modified_files += xy == b".M"
+                    added_files += xy[:1] == b"A"
+                elif kind == b"?":
+                    changes += 1
+                    untracked_files += 1
+
+            return {
+                "current_branch": current_branch,
+                "modified_files": modified_files,
+                "added_files": added_files,
+                "untracked_files": untracked_files,
+                "has_changes": changes > 0,
+                "repo_path": target_repo,
+            }
 
-                # Get status
-                status_result = subprocess.run(
-                    ["git", "status", "--porcelain"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+        return self.execute_with_tracking("get_repository_status", _status_operation)
 
-                # Count changes
-                status_lines = (
-                    status_result.stdout.strip().split("\n")
-                    if status_result.stdout.strip()
-                    else []
-                )
-                modified_files = [
-                    line for line in status_lines if line.startswith(" M")
-                ]
-                added_files = [line for line in status_lines if line.startswith("A")]
-                untracked_files = [
-                    line for line in status_lines if line.startswith("??")
-                ]
-
-                return {
-                    "current_branch": current_branch,
-                    "modified_files": len(modified_files),
-                    "added_files": len(added_files),
-                    "untracked_files": len(untracked_files),
-                    "has_changes": len(status_lines) > 0,
-                    "repo_path": target_repo,
-                }
-
-            finally:
-                os.chdir(original_dir)
+    def _status_in_process(self, repo: "pygit2.Repository", repo_path: str) -> dict:
+        """
+        Build get_repository_status's result from libgit2's status flags.
 
-        return self.execute_with_tracking("get_repository_status", _status_operation)
+        Args:
+            repo: Repository to inspect
+            repo_path: Path to the repository, reported back
+
+        Returns:
+            dict: Repository status information
+        """
+        if repo.head_is_detached:
+            current_branch = ""
+        elif repo.head_is_unborn:
+            current_branch = repo.references["HEAD"].target[len("refs/heads/") :]
+        else:
+            current_branch = repo.head.shorthand
+
+        # Same counts as the porcelain ".M", "A." and "?" records
+        status = repo.status(untracked_files="all")
+        flags = status.values()
+        return {
+            "current_branch": current_branch,
+            "modified_files": sum(f == pygit2.GIT_STATUS_WT_MODIFIED for f in flags),
+            "added_files": sum(bool(f & pygit2.GIT_STATUS_INDEX_NEW) for f in flags),
+            "untracked_files": sum(f == pygit2.GIT_STATUS_WT_NEW for f in flags),
+            "has_changes": len(status) > 0,
+            "repo_path": repo_path,
+        }
 
     def execute(self, action: str, **kwargs) -> any:
         """
@@ -456,21 +1036,61 @@ class GitOperationsAgent(BaseAgent):
         Returns:
             Result of the action
         """
-        action_map = {
-            "clone": self.clone_repository,
-            "create_branch": self.create_unique_branch,
-            "switch_branch": self.create_and_switch_branch,
-            "commit": self.commit_changes,
-            "push": self.push_branch,
-            "status": self.get_repository_status,
-        }
-
-        if action not in action_map:
+        handler = self._action_map.get(action)
+        if handler is None:
             self.log(f"Unknown action: {action}", "error")
             return None
 
         try:
-            return action_map[action](**kwargs)
+            return handler(**kwargs)
         except Exception as e:
             self.log(f"Error executing action {action}: {e}", "error")
             return None
+
+    def _repo_lock(self, repo_path: Optional[str]) -> threading.Lock:
+        """Get the lock serializing execute_many's work on one repository."""
+        with self._repo_locks_lock:
+            return self._repo_locks.setdefault(repo_path, threading.Lock())
+
+    def execute_many(self, actions: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Run several actions, with actions on different repositories in parallel.
+
+        Actions on the same repository run one after another in the given
+        order. Pass repo_path (or clone_path for "clone") explicitly; actions
+        without one fall back to the current repository.
+
+        Args:
+            actions: (action, kwargs) pairs, as taken by execute()
+
+        Returns:
+            List[Any]: The result of each action, in the same order
+        """
+        groups: Dict[Optional[str], List[int]] = {}
+        for index, (_, kwargs) in enumerate(actions):
+            target_repo = (
+                kwargs.get("repo_path")
+                or kwargs.get("clone_path")
+                or self.get_state("current_repo")
+            )
+            groups.setdefault(target_repo, []).append(index)
+
+        results: List[Any] = [None] * len(actions)
+
+        def _run_group(target_repo: Optional[str], indices: List[int]) -> None:
+            with self._repo_lock(target_repo):
+                for index in indices:
+                    action, kwargs = actions[index]
+                    results[index] = self.execute(action, **kwargs)
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=_GIT_WORKERS, thread_name_prefix="git-ops"
+            )
+        futures = [
+            self._executor.submit(_run_group, target_repo, indices)
+            for target_repo, indices in groups.items()
+        ]
+        for future in futures:
+            future.result()
+        return results
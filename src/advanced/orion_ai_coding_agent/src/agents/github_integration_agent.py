@@ -4,16 +4,58 @@ GitHub Integration Agent for Orion AI Agent System
 This agent handles all GitHub-related operations using Composio integration.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import os
-import sys
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from composio import Composio
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
+from ..base_agent import BaseAgent
+
+# Clients are shared process-wide so every agent instance reuses the same
+# keep-alive connection pools instead of paying a TLS handshake per instance.
+_CLIENT_LOCK = threading.Lock()
+_OPENAI_CLIENT: Optional[OpenAI] = None
+_COMPOSIO_CLIENTS: Dict[str, Composio] = {}
+
+
+def _get_openai_client() -> OpenAI:
+    """
+    Get the shared OpenAI client, creating it on first use.
+
+    The SDK retries 429 and 5xx responses with jittered exponential backoff.
+
+    Returns:
+        OpenAI: Shared client instance
+    """
+    global _OPENAI_CLIENT
+    with _CLIENT_LOCK:
+        if _OPENAI_CLIENT is None:
+            _OPENAI_CLIENT = OpenAI(max_retries=5)
+        return _OPENAI_CLIENT
+
+
+def _get_composio_client(api_key: str) -> Composio:
+    """
+    Get the shared Composio client for an API key, creating it on first use.
+
+    Args:
+        api_key: Composio API key
+
+    Returns:
+        Composio: Shared client instance
+    """
+    with _CLIENT_LOCK:
+        client = _COMPOSIO_CLIENTS.get(api_key)
+        if client is None:
+            client = _COMPOSIO_CLIENTS[api_key] = Composio(api_key=api_key)
+        return client
 
 
 class GitHubIntegrationAgent(BaseAgent):
@@ -27,6 +69,11 @@ class GitHubIntegrationAgent(BaseAgent):
     - Format GitHub API responses
     """
 
+    # Seconds a repository listing stays valid in the on-disk cache
+    REPO_CACHE_TTL = 1800
+    # Seconds a successful authentication check is reused
+    AUTH_CACHE_TTL = 60
+
     def __init__(self, debug: bool = False):
         """
         Initialize the GitHub Integration Agent.
@@ -37,6 +84,15 @@ class GitHubIntegrationAgent(BaseAgent):
         super().__init__("GitHubIntegration", debug)
         self.openai_client = None
         self.composio_client = None
+        # The async client's connections belong to one event loop, so it is
+        # per agent and replaced when called from a different loop
+        self._async_openai_client: Optional[AsyncOpenAI] = None
+        self._async_openai_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._auth_checked_at = None
+        self._cache_dir = os.path.join(
+            os.path.expanduser(os.environ.get("ORION_CACHE_DIR", "~/.cache/orion")),
+            "gh",
+        )
         self.update_state("authenticated", False)
         self.update_state("repositories", [])
         self.update_state("pull_requests", [])
@@ -50,7 +106,7 @@ class GitHubIntegrationAgent(BaseAgent):
         """
         try:
             if not self.openai_client:
-                self.openai_client = OpenAI()
+                self.openai_client = _get_openai_client()
                 self.log("OpenAI client initialized")
 
             if not self.composio_client:
@@ -59,7 +115,7 @@ class GitHubIntegrationAgent(BaseAgent):
                     self.log("COMPOSIO_API_KEY not found", "error")
                     return False
 
-                self.composio_client = Composio(api_key=api_key)
+                self.composio_client = _get_composio_client(api_key)
                 self.log("Composio client initialized")
 
             return True
@@ -68,6 +124,27 @@ class GitHubIntegrationAgent(BaseAgent):
             self.log(f"Failed to initialize clients: {e}", "error")
             return False
 
+    async def _get_async_openai_client(self) -> AsyncOpenAI:
+        """
+        Get the AsyncOpenAI client for the running event loop.
+
+        The client made for a previous loop is closed when it is replaced.
+
+        Returns:
+            AsyncOpenAI: Client instance, retrying like the shared sync client
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_openai_loop is not loop:
+            stale_client = self._async_openai_client
+            self._async_openai_client = AsyncOpenAI(max_retries=5)
+            self._async_openai_loop = loop
+            if stale_client is not None:
+                try:
+                    await stale_client.close()
+                except Exception:
+                    pass  # The old loop's sockets are released when garbage collected
+        return self._async_openai_client
+
     def check_authentication(self) -> bool:
         """
         Check if authentication is properly set up.
@@ -75,6 +152,11 @@ class GitHubIntegrationAgent(BaseAgent):
         Returns:
             bool: True if authentication is properly configured, False otherwise
         """
+        if (
+            self._auth_checked_at is not None
+            and time.monotonic() - self._auth_checked_at < self.AUTH_CACHE_TTL
+        ):
+            return True
 
         def _auth_check():
             required_vars = ["COMPOSIO_API_KEY", "USER_ID"]
@@ -99,14 +181,165 @@ class GitHubIntegrationAgent(BaseAgent):
             return True
 
         result = self.execute_with_tracking("check_authentication", _auth_check)
-        return result is not None and result
+        authenticated = result is not None and result
+        self._auth_checked_at = time.monotonic() if authenticated else None
+        return authenticated
+
+    def _repo_cache_path(self, user_id: str, limit: int) -> str:
+        """
+        Get the cache file path for a repository listing.
+
+        Args:
+            user_id: Composio user ID
+            limit: Number of repositories requested
 
-    def list_repositories(self, limit: int = 5) -> Optional[List[Dict]]:
+        Returns:
+            str: Path to the cache file
+        """
+        key = hashlib.sha1(f"{user_id}:{limit}".encode()).hexdigest()
+        return os.path.join(self._cache_dir, f"repos_{key}.json")
+
+    def _read_repo_cache(self, user_id: str, limit: int) -> Optional[Dict]:
+        """
+        Read a cached repository listing if it has not expired.
+
+        Args:
+            user_id: Composio user ID
+            limit: Number of repositories requested
+
+        Returns:
+            Dict: Cached entry, or None if missing or stale
+        """
+        try:
+            with open(self._repo_cache_path(user_id, limit), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("fetched_at", 0) > self.REPO_CACHE_TTL:
+            return None
+        return entry
+
+    def _write_repo_cache(
+        self, user_id: str, limit: int, result, formatted_result: str
+    ) -> None:
+        """
+        Store a repository listing in the on-disk cache.
+
+        Args:
+            user_id: Composio user ID
+            limit: Number of repositories requested
+            result: Raw result from the Composio tool call
+            formatted_result: Formatted listing shown to the user
+        """
+        entry = {
+            "fetched_at": time.time(),
+            "result": result,
+            "formatted_result": formatted_result,
+        }
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(self._repo_cache_path(user_id, limit), "w") as f:
+                json.dump(entry, f)
+        except (OSError, TypeError, ValueError) as e:
+            self.log(f"Could not cache repository listing: {e}", "debug")
+
+    def _cached_repositories(self, user_id: str, limit: int) -> Optional[str]:
+        """
+        Load a cached repository listing into state.
+
+        Args:
+            user_id: Composio user ID
+            limit: Number of repositories requested
+
+        Returns:
+            str: Cached formatted listing, or None if there is no fresh entry
+        """
+        cached = self._read_repo_cache(user_id, limit)
+        if not cached:
+            return None
+        self.log("📦 Using cached repository listing")
+        self.update_state("repositories", cached["result"])
+        self.update_state("last_repo_fetch", cached["fetched_at"])
+        return cached["formatted_result"]
+
+    def _repo_listing_request(self, limit: int, tools) -> Dict:
+        """
+        Build the chat completion arguments for listing repositories.
+
+        Args:
+            limit: Number of repositories to list
+            tools: GitHub tools from Composio
+
+        Returns:
+            Dict: Keyword arguments for chat.completions.create
+        """
+        # Create task for listing repositories
+        task = f"List {limit} repositories from the user's GitHub account. Include details like name, description, stars, forks, language, and URLs."
+
+        self.log(f"🔍 Fetching {limit} repositories from GitHub account...")
+        return {
+            "model": "gpt-5-mini",
+            "messages": [{"role": "user", "content": task}],
+            "tools": tools,
+        }
+
+    @staticmethod
+    def _has_repositories(result) -> bool:
+        """
+        Check whether a Composio result holds a successful repository listing.
+
+        Args:
+            result: Raw result from the Composio tool call
+
+        Returns:
+            bool: True if any tool call succeeded and returned repositories
+        """
+        if not isinstance(result, list):
+            return False
+        return any(
+            isinstance(item, dict)
+            and item.get("successful", True)
+            and isinstance(item.get("data"), dict)
+            and isinstance(item["data"].get("details"), list)
+            and bool(item["data"]["details"])
+            for item in result
+        )
+
+    def _record_repositories(self, user_id: str, limit: int, result) -> str:
+        """
+        Format a repository listing, store it in state and cache it.
+
+        Only listings with repositories in them are cached, so a failed or
+        empty tool call isn't served from the cache for REPO_CACHE_TTL.
+
+        Args:
+            user_id: Composio user ID
+            limit: Number of repositories requested
+            result: Raw result from the Composio tool call
+
+        Returns:
+            str: Formatted listing
+        """
+        formatted_result = self._format_repository_results(result)
+
+        # Update state
+        self.update_state("repositories", result)
+        self.update_state("last_repo_fetch", time.time())
+        if self._has_repositories(result):
+            self._write_repo_cache(user_id, limit, result, formatted_result)
+
+        return formatted_result
+
+    def list_repositories(
+        self, limit: int = 5, use_cache: bool = True
+    ) -> Optional[List[Dict]]:
         """
         List repositories from the user's GitHub account using Composio.
 
         Args:
             limit: Number of repositories to list
+            use_cache: Whether to reuse a listing cached within REPO_CACHE_TTL
 
         Returns:
             List[Dict]: List of repository information, or None if failed
@@ -116,24 +349,22 @@ class GitHubIntegrationAgent(BaseAgent):
             if not self.check_authentication():
                 return None
 
+            user_id = os.getenv("USER_ID")
+
+            if use_cache:
+                cached = self._cached_repositories(user_id, limit)
+                if cached:
+                    return cached
+
             if not self._initialize_clients():
                 return None
 
-            user_id = os.getenv("USER_ID")
-
             # Get GitHub tools
             tools = self.composio_client.tools.get(user_id=user_id, toolkits=["GITHUB"])
 
-            # Create task for listing repositories
-            task = f"List {limit} repositories from the user's GitHub account. Include details like name, description, stars, forks, language, and URLs."
-
-            self.log(f"🔍 Fetching {limit} repositories from GitHub account...")
-
             # Create a chat completion request
             response = self.openai_client.chat.completions.create(
-                model="gpt-5-mini",
-                messages=[{"role": "user", "content": task}],
-                tools=tools,
+                **self._repo_listing_request(limit, tools)
             )
 
             # Handle tool calls
@@ -141,16 +372,196 @@ class GitHubIntegrationAgent(BaseAgent):
                 user_id=user_id, response=response
             )
 
-            # Format and store results
-            formatted_result = self._format_repository_results(result)
+            return self._record_repositories(user_id, limit, result)
 
-            # Update state
-            self.update_state("repositories", result)
-            self.update_state("last_repo_fetch", time.time())
+        return self.execute_with_tracking("list_repositories", _list_repos_operation)
 
-            return formatted_result
+    async def alist_repositories(
+        self, limit: int = 5, use_cache: bool = True
+    ) -> Optional[List[Dict]]:
+        """
+        List repositories without blocking the event loop.
 
-        return self.execute_with_tracking("list_repositories", _list_repos_operation)
+        Takes the same arguments as list_repositories. Composio's client is
+        synchronous, so its calls run in worker threads.
+
+        Returns:
+            List[Dict]: List of repository information, or None if failed
+        """
+
+        async def _list_repos_operation():
+            if not self.check_authentication():
+                return None
+
+            user_id = os.getenv("USER_ID")
+
+            if use_cache:
+                cached = self._cached_repositories(user_id, limit)
+                if cached:
+                    return cached
+
+            if not self._initialize_clients():
+                return None
+
+            tools = await asyncio.to_thread(
+                self.composio_client.tools.get, user_id=user_id, toolkits=["GITHUB"]
+            )
+            client = await self._get_async_openai_client()
+            response = await client.chat.completions.create(
+                **self._repo_listing_request(limit, tools)
+            )
+            result = await asyncio.to_thread(
+                self.composio_client.provider.handle_tool_calls,
+                user_id=user_id,
+                response=response,
+            )
+
+            return self._record_repositories(user_id, limit, result)
+
+        return await self.aexecute_with_tracking(
+            "alist_repositories", _list_repos_operation
+        )
+
+    def _pr_tools(self, user_id: str) -> Optional[List]:
+        """
+        Get the Composio tools for creating a pull request.
+
+        Args:
+            user_id: Composio user ID
+
+        Returns:
+            List: GitHub tools, or None if none are available
+        """
+        # Get specific GitHub PR creation tools
+        pr_tools = ["GITHUB_CREATE_A_PULL_REQUEST", "GITHUB_PULLS_CREATE"]
+        tools = self.composio_client.tools.get(user_id=user_id, tools=pr_tools)
+        self.log(f"🔍 Retrieved {len(tools)} GitHub PR tools from Composio")
+        if not tools:
+            self.log(
+                "❌ No GitHub PR tools available - check Composio GitHub integration",
+                "error",
+            )
+            # Fallback to all GitHub tools if specific ones aren't available
+            tools = self.composio_client.tools.get(user_id=user_id, toolkits=["GITHUB"])
+            self.log(f"🔍 Fallback: Retrieved {len(tools)} general GitHub tools")
+            if not tools:
+                return None
+        return tools
+
+    def _pr_request(
+        self, repo_url: str, title: str, body: str, branch_name: str, tools
+    ) -> Tuple[str, Dict]:
+        """
+        Build the chat completion arguments for creating a pull request.
+
+        Args:
+            repo_url: GitHub repository URL
+            title: Pull request title
+            body: Pull request body/description
+            branch_name: Source branch name for the PR
+            tools: GitHub tools from Composio
+
+        Returns:
+            Tuple[str, Dict]: The prefixed PR title and keyword arguments for
+            chat.completions.create
+        """
+        # Extract owner and repo from URL
+        repo_parts = repo_url.replace(".git", "").split("/")
+        owner = repo_parts[-2]
+        repo = repo_parts[-1]
+
+        self.log(f"🚀 Creating pull request for {owner}/{repo}...")
+        self.log(f"   📋 Title: {title}")
+        self.log(f"   🌿 Branch: {branch_name} → main")
+
+        # Don't add prefix if title already has orion prefix
+        if not title.startswith(":robot: [orion]"):
+            formatted_title = f":robot: [orion] {title}"
+        else:
+            formatted_title = title
+
+        # Create task for PR creation
+        task = f"""Create a pull request in the GitHub repository {owner}/{repo} with the following details:
+            - Title: {formatted_title}
+            - Body: {body}
+            - Head branch: {branch_name}
+            - Base branch: main
+            
+            Please use the GitHub API to create this pull request and return the PR details including URL, number, and status."""
+
+        # Create a chat completion request
+        self.log(f"🔍 Available GitHub tools: {len(tools)}")
+        self.log(f"🔍 Task prompt: {task}")
+
+        return formatted_title, {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that creates GitHub pull requests using the available GitHub tools.",
+                },
+                {"role": "user", "content": task},
+            ],
+            "tools": tools,
+        }
+
+    def _log_pr_response(self, response) -> None:
+        """
+        Log the tool calls OpenAI generated for a pull request.
+
+        Args:
+            response: Chat completion response
+        """
+        self.log(f"🔍 OpenAI response message: {response.choices[0].message}")
+        if (
+            hasattr(response.choices[0].message, "tool_calls")
+            and response.choices[0].message.tool_calls
+        ):
+            self.log(
+                f"🔍 Tool calls generated: {len(response.choices[0].message.tool_calls)}"
+            )
+            for i, tool_call in enumerate(response.choices[0].message.tool_calls):
+                self.log(f"🔍 Tool call {i+1}: {tool_call.function.name}")
+        else:
+            self.log("⚠️ No tool calls generated by OpenAI")
+
+    def _record_pull_request(
+        self, repo_url: str, title: str, body: str, branch_name: str, result
+    ) -> Dict:
+        """
+        Format a pull request result and store it in state.
+
+        Args:
+            repo_url: GitHub repository URL
+            title: Pull request title, with the orion prefix
+            body: Pull request body/description
+            branch_name: Source branch name for the PR
+            result: Raw result from the Composio tool call
+
+        Returns:
+            Dict: Formatted result, PR URL and raw result
+        """
+        formatted_result = self._format_pr_results(result)
+        pr_url = self.extract_pr_url(result)
+
+        # Update state
+        pr_info = {
+            "repo_url": repo_url,
+            "title": title,
+            "body": body,
+            "branch_name": branch_name,
+            "result": result,
+            "pr_url": pr_url,
+            "timestamp": time.time(),
+        }
+        self.append_state("pull_requests", pr_info)
+
+        # Return both formatted result and raw data including URL
+        return {
+            "formatted_result": formatted_result,
+            "pr_url": pr_url,
+            "result": result,
+        }
 
     def create_pull_request(
         self,
@@ -180,111 +591,76 @@ class GitHubIntegrationAgent(BaseAgent):
                 return None
 
             user_id = os.getenv("USER_ID")
-
-            # Get specific GitHub PR creation tools
-            pr_tools = ["GITHUB_CREATE_A_PULL_REQUEST", "GITHUB_PULLS_CREATE"]
-            tools = self.composio_client.tools.get(user_id=user_id, tools=pr_tools)
-            self.log(f"🔍 Retrieved {len(tools)} GitHub PR tools from Composio")
+            tools = self._pr_tools(user_id)
             if not tools:
-                self.log(
-                    "❌ No GitHub PR tools available - check Composio GitHub integration",
-                    "error",
-                )
-                # Fallback to all GitHub tools if specific ones aren't available
-                tools = self.composio_client.tools.get(
-                    user_id=user_id, toolkits=["GITHUB"]
-                )
-                self.log(f"🔍 Fallback: Retrieved {len(tools)} general GitHub tools")
-                if not tools:
-                    return None
-
-            # Extract owner and repo from URL
-            repo_parts = repo_url.replace(".git", "").split("/")
-            owner = repo_parts[-2]
-            repo = repo_parts[-1]
-
-            self.log(f"🚀 Creating pull request for {owner}/{repo}...")
-            self.log(f"   📋 Title: {title}")
-            self.log(f"   🌿 Branch: {branch_name} → main")
-
-            # Don't add prefix if title already has orion prefix
-            if not title.startswith(":robot: [orion]"):
-                formatted_title = f":robot: [orion] {title}"
-            else:
-                formatted_title = title
-
-            # Create task for PR creation
-            task = f"""Create a pull request in the GitHub repository {owner}/{repo} with the following details:
-            - Title: {formatted_title}
-            - Body: {body}
-            - Head branch: {branch_name}
-            - Base branch: main
-            
-            Please use the GitHub API to create this pull request and return the PR details including URL, number, and status."""
-
-            # Create a chat completion request
-            self.log(f"🔍 Available GitHub tools: {len(tools)}")
-            self.log(f"🔍 Task prompt: {task}")
+                return None
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates GitHub pull requests using the available GitHub tools.",
-                    },
-                    {"role": "user", "content": task},
-                ],
-                tools=tools,
+            formatted_title, request = self._pr_request(
+                repo_url, title, body, branch_name, tools
             )
-
-            # Log the OpenAI response
-            self.log(f"🔍 OpenAI response message: {response.choices[0].message}")
-            if (
-                hasattr(response.choices[0].message, "tool_calls")
-                and response.choices[0].message.tool_calls
-            ):
-                self.log(
-                    f"🔍 Tool calls generated: {len(response.choices[0].message.tool_calls)}"
-                )
-                for i, tool_call in enumerate(response.choices[0].message.tool_calls):
-                    self.log(f"🔍 Tool call {i+1}: {tool_call.function.name}")
-            else:
-                self.log("⚠️ No tool calls generated by OpenAI")
+            response = self.openai_client.chat.completions.create(**request)
+            self._log_pr_response(response)
 
             # Handle tool calls
             result = self.composio_client.provider.handle_tool_calls(
                 user_id=user_id, response=response
             )
 
-            # Format and store results
-            formatted_result = self._format_pr_results(result)
-            pr_url = self.extract_pr_url(result)
-
-            # Update state
-            pr_info = {
-                "repo_url": repo_url,
-                "title": formatted_title,
-                "body": body,
-                "branch_name": branch_name,
-                "result": result,
-                "pr_url": pr_url,
-                "timestamp": time.time(),
-            }
-
-            pull_requests = self.get_state("pull_requests", [])
-            pull_requests.append(pr_info)
-            self.update_state("pull_requests", pull_requests)
-
-            # Return both formatted result and raw data including URL
-            return {
-                "formatted_result": formatted_result,
-                "pr_url": pr_url,
-                "result": result,
-            }
+            return self._record_pull_request(
+                repo_url, formatted_title, body, branch_name, result
+            )
 
         return self.execute_with_tracking("create_pull_request", _create_pr_operation)
 
+    async def acreate_pull_request(
+        self,
+        repo_url: str,
+        title: str,
+        body: str,
+        branch_name: str = "orion/ai-automated-update",
+    ) -> Optional[Dict]:
+        """
+        Create a GitHub pull request without blocking the event loop.
+
+        Takes the same arguments as create_pull_request. Composio's client is
+        synchronous, so its calls run in worker threads.
+
+        Returns:
+            Dict: Pull request information, or None if failed
+        """
+
+        async def _create_pr_operation():
+            if not self.check_authentication():
+                return None
+
+            if not self._initialize_clients():
+                return None
+
+            user_id = os.getenv("USER_ID")
+            tools = await asyncio.to_thread(self._pr_tools, user_id)
+            if not tools:
+                return None
+
+            formatted_title, request = self._pr_request(
+                repo_url, title, body, branch_name, tools
+            )
+            client = await self._get_async_openai_client()
+            response = await client.chat.completions.create(**request)
+            self._log_pr_response(response)
+            result = await asyncio.to_thread(
+                self.composio_client.provider.handle_tool_calls,
+                user_id=user_id,
+                response=response,
+            )
+
+            return self._record_pull_request(
+                repo_url, formatted_title, body, branch_name, result
+            )
+
+        return await self.aexecute_with_tracking(
+            "acreate_pull_request", _create_pr_operation
+        )
+
     def _format_repository_results(self, result) -> str:
         """
         Format repository listing results in a structured way.
@@ -479,3 +855,45 @@ class GitHubIntegrationAgent(BaseAgent):
         except Exception as e:
             self.log(f"Error executing action {action}: {e}", "error")
             return None
+
+    async def aexecute(self, action: str, **kwargs) -> any:
+        """
+        Async counterpart of execute, for use inside an event loop.
+
+        Network-bound actions await their async variants; the others run
+        inline.
+
+        Args:
+            action: The action to perform
+            **kwargs: Action-specific arguments
+
+        Returns:
+            Result of the action
+        """
+        async_action_map = {
+            "list_repos": self.alist_repositories,
+            "create_pr": self.acreate_pull_request,
+        }
+
+        if action not in async_action_map:
+            return self.execute(action, **kwargs)
+
+        try:
+            return await async_action_map[action](**kwargs)
+        except Exception as e:
+            self.log(f"Error executing action {action}: {e}", "error")
+            return None
+
+
+@functools.lru_cache(maxsize=4)
+def get_agent(debug: bool = False) -> GitHubIntegrationAgent:
+    """
+    Get a shared GitHub Integration Agent for the given debug setting.
+
+    Args:
+        debug: Whether to enable debug mode
+
+    Returns:
+        GitHubIntegrationAgent: Memoized agent instance
+    """
+    return GitHubIntegrationAgent(debug=debug)
@@ -5,8 +5,8 @@ This agent uses LangGraph to provide intelligent workflow orchestration with
 dynamic routing, parallel processing, and enhanced error recovery capabilities.
 """
 
+import asyncio
 import os
-import sys
 from operator import add
 from typing import Annotated, Dict, List, Optional, TypedDict
 
@@ -15,9 +15,7 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
-
+from ..base_agent import BaseAgent
 from .ai_generator_agent import AIGeneratorAgent
 from .code_tester_agent import CodeTesterAgent
 from .environment_manager_agent import EnvironmentManagerAgent
@@ -133,9 +131,8 @@ class LangGraphOrchestratorAgent(BaseAgent):
 
         # Add all workflow nodes
         workflow.add_node("analyze_repository", self._analyze_repository)
-        workflow.add_node("classify_task", self._classify_task_node)
+        workflow.add_node("classify_and_setup", self._run_phase_parallel)
         workflow.add_node("scan_repository", self._scan_repository_node)
-        workflow.add_node("setup_repository", self._setup_repository_node)
         workflow.add_node("generate_code", self._generate_code_node)
         workflow.add_node("setup_environment", self._setup_environment_node)
         workflow.add_node("run_tests", self._run_tests_node)
@@ -152,32 +149,26 @@ class LangGraphOrchestratorAgent(BaseAgent):
             "analyze_repository",
             self._route_after_analysis,
             {
-                "classify_task": "classify_task",
+                "classify_and_setup": "classify_and_setup",
                 "error": "error_recovery",
             },
         )
 
+        # Task classification only needs the prompt and repository setup only
+        # needs the URL, so both run concurrently inside one fan-out node
         workflow.add_conditional_edges(
-            "classify_task",
-            self._route_after_classification,
+            "classify_and_setup",
+            self._route_after_repo_setup,
             {
                 "scan_repository": "scan_repository",
-                "setup_repository": "setup_repository",
+                "generate_code": "generate_code",
+                "parallel_setup": "parallel_coordinator",
                 "error": "error_recovery",
             },
         )
 
         workflow.add_conditional_edges(
             "scan_repository",
-            self._route_after_scan,
-            {
-                "setup_repository": "setup_repository",
-                "error": "error_recovery",
-            },
-        )
-
-        workflow.add_conditional_edges(
-            "setup_repository",
             self._route_after_repo_setup,
             {
                 "scan_repository": "scan_repository",
@@ -392,21 +383,57 @@ class LangGraphOrchestratorAgent(BaseAgent):
         """Route after repository analysis."""
         if state["status"] == "error":
             return "error"
-        return "classify_task"
+        return "classify_and_setup"
 
-    def _route_after_classification(self, state: WorkflowState) -> str:
-        """Route after task classification."""
-        if state["status"] == "error":
-            return "error"
+    async def _run_phase_parallel(self, state: WorkflowState) -> WorkflowState:
+        """
+        Classify the task and set up the repository concurrently.
 
-        # Always setup repository first, then optionally scan
-        return "setup_repository"
+        Each phase runs in a worker thread on its own copy of the state, and
+        the results are merged back once both have finished.
 
-    def _route_after_scan(self, state: WorkflowState) -> str:
-        """Route after repository scan."""
-        if state["status"] == "error":
-            return "error"
-        return "setup_repository"
+        Args:
+            state: Current workflow state
+
+        Returns:
+            Updated workflow state
+        """
+        self.log("⚡ Classifying task and setting up repository in parallel...")
+
+        phases = (self._classify_task_node, self._setup_repository_node)
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    phase,
+                    dict(state, completed_phases=[], failed_phases=[], error=None),
+                )
+                for phase in phases
+            ),
+            return_exceptions=True,
+        )
+
+        errors = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(str(result))
+                continue
+
+            for key in ("task_classification", "repo_path", "branch_name"):
+                if result.get(key) is not None:
+                    state[key] = result[key]
+            state["completed_phases"].extend(result["completed_phases"])
+            state["failed_phases"].extend(result["failed_phases"])
+            if result.get("status") == "error":
+                errors.append(result.get("error") or "Unknown error")
+
+        if errors:
+            state["error"] = "; ".join(errors)
+            state["status"] = "error"
+        else:
+            state["current_phase"] = "repository_setup"
+            state["status"] = "repo_ready"
+
+        return state
 
     def _setup_repository_node(self, state: WorkflowState) -> WorkflowState:
         """Repository setup node for LangGraph workflow."""
@@ -744,7 +771,7 @@ class LangGraphOrchestratorAgent(BaseAgent):
         """Route after repository analysis."""
         if state["status"] == "error":
             return "error"
-        return "classify_task"
+        return "classify_and_setup"
 
     def _route_after_repo_setup(self, state: WorkflowState) -> str:
         """Route after repository setup."""
@@ -893,21 +920,7 @@ class LangGraphOrchestratorAgent(BaseAgent):
                 config = {"configurable": {"thread_id": initial_state["session_id"]}}
 
                 # Run the workflow
-                final_state = initial_state
-                for chunk in self.app.stream(initial_state, config):
-                    # Each chunk contains the state updates from different nodes
-                    if isinstance(chunk, dict):
-                        for node_name, node_state in chunk.items():
-                            if isinstance(node_state, dict):
-                                # Update final_state with the latest node state
-                                final_state.update(node_state)
-
-                                # Log current state
-                                current_phase = node_state.get(
-                                    "current_phase", "unknown"
-                                )
-                                status = node_state.get("status", "unknown")
-                                self.log(f"📊 Phase: {current_phase}, Status: {status}")
+                final_state = asyncio.run(self._stream_workflow(initial_state, config))
 
                 # Ensure we have a final status and duration
                 if final_state.get("status") in [
@@ -938,6 +951,33 @@ class LangGraphOrchestratorAgent(BaseAgent):
             or {}
         )
 
+    async def _stream_workflow(self, initial_state: WorkflowState, config: Dict) -> Dict:
+        """
+        Drive the compiled graph asynchronously so fan-out nodes can overlap.
+
+        Args:
+            initial_state: Initial workflow state
+            config: LangGraph run configuration
+
+        Returns:
+            Dict: Final workflow state
+        """
+        final_state = initial_state
+        async for chunk in self.app.astream(initial_state, config):
+            # Each chunk contains the state updates from different nodes
+            if isinstance(chunk, dict):
+                for node_name, node_state in chunk.items():
+                    if isinstance(node_state, dict):
+                        # Update final_state with the latest node state
+                        final_state.update(node_state)
+
+                        # Log current state
+                        current_phase = node_state.get("current_phase", "unknown")
+                        status = node_state.get("status", "unknown")
+                        self.log(f"📊 Phase: {current_phase}, Status: {status}")
+
+        return final_state
+
     def execute(self, action: str, **kwargs) -> any:
         """
         Main execution method for the LangGraph Orchestrator Agent.
@@ -7,12 +7,10 @@ to understand the structure and content of existing codebases.
 
 import os
 import re
-import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
+from ..base_agent import BaseAgent
 
 
 class RepositoryScannerAgent(BaseAgent):
@@ -5,13 +5,10 @@ This agent handles task analysis and classification to determine the appropriate
 action (modify existing files vs create new files) and identify target files.
 """
 
-import os
 import re
-import sys
 from typing import Dict, List, Optional, Set, Tuple
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.base_agent import BaseAgent
+from ..base_agent import BaseAgent
 
 
 class TaskClassifierAgent(BaseAgent):
@@ -5,9 +5,10 @@ This module provides the base agent functionality that all specific agents inher
 """
 
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 
 class BaseAgent(ABC):
@@ -28,6 +29,8 @@ class BaseAgent(ABC):
         self.name = name
         self.debug = debug
         self.state = {}
+        # Guards in-place updates of state values shared between threads
+        self._state_lock = threading.Lock()
         self.execution_history = []
 
         # Setup logging
@@ -65,6 +68,33 @@ class BaseAgent(ABC):
         self.state[key] = value
         self.log(f"State updated: {key} = {value}", "debug")
 
+    def append_state(self, key: str, item: Any) -> None:
+        """
+        Append an item to a list in the agent's state, creating the list if needed.
+
+        The list is updated in place, so the cost doesn't grow with its length.
+
+        Args:
+            key: State key
+            item: Item to append
+        """
+        with self._state_lock:
+            self.state.setdefault(key, []).append(item)
+        self.log(f"State appended: {key} += {item}", "debug")
+
+    def merge_state(self, key: str, subkey: str, value: Any) -> None:
+        """
+        Set one entry of a dict in the agent's state, creating the dict if needed.
+
+        Args:
+            key: State key
+            subkey: Key within the state dict
+            value: Value to store under subkey
+        """
+        with self._state_lock:
+            self.state.setdefault(key, {})[subkey] = value
+        self.log(f"State merged: {key}[{subkey!r}] = {value}", "debug")
+
     def get_state(self, key: str, default: Any = None) -> Any:
         """
         Get a value from the agent's state.
@@ -126,6 +156,31 @@ class BaseAgent(ABC):
             self.log(f"Failed action: {action_name} ❌ Error: {e}", "error")
             return None
 
+    async def aexecute_with_tracking(
+        self, action_name: str, operation: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Async counterpart of execute_with_tracking.
+
+        Args:
+            action_name: Name of the action being performed
+            operation: Coroutine function to run
+
+        Returns:
+            The operation's result, or None if an error occurred
+        """
+        self.log(f"Starting action: {action_name}")
+        start_time = time.time()
+        try:
+            result = await operation()
+        except Exception as e:
+            self.record_execution(action_name, e, time.time() - start_time)
+            self.log(f"Failed action: {action_name} ❌ Error: {e}", "error")
+            return None
+        self.record_execution(action_name, result, time.time() - start_time)
+        self.log(f"Completed action: {action_name} ✅")
+        return result
+
     def get_execution_summary(self) -> Dict[str, Any]:
         """
         Get a summary of the agent's execution history.
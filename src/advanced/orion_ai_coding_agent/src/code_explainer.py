@@ -1,10 +1,16 @@
 import ast
+import hashlib
 import os
+import shutil
 import subprocess
+from pathlib import Path
 from typing import Optional
 
 from openai import OpenAI
 
+# Number of cached clones kept before the least recently used are removed
+_MAX_CACHED_CLONES = 10
+
 
 def _extract_docstring(file_path: str) -> Optional[str]:
     """Extract the top-level docstring from a Python file."""
@@ -38,6 +44,59 @@ def _summarize_repository(repo_path: str) -> str:
     return "\n".join(sorted(lines))
 
 
+def _clone_cache_root(workdir: str) -> Path:
+    """Return the directory holding cached clones ($ORION_CACHE_DIR overrides)."""
+    cache_dir = os.environ.get("ORION_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir).expanduser() / "repos"
+    return Path(workdir) / ".orion_cache"
+
+
+def _sweep_clone_cache(cache_root: Path, keep: int = _MAX_CACHED_CLONES) -> None:
+    """Remove all but the ``keep`` most recently used cached clones."""
+    try:
+        clones = sorted(
+            (p for p in cache_root.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+    except OSError:
+        return
+    for stale in clones[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def _checkout_cached_clone(
+    repo_url: str, workdir: str, branch: Optional[str] = None
+) -> Path:
+    """Shallow-clone a repository into the cache, or refresh an existing clone.
+
+    Clones are keyed by repository URL. Repeat runs fetch only the tip of the
+    requested branch instead of cloning again.
+    """
+    cache_root = _clone_cache_root(workdir)
+    clone_dir = cache_root / hashlib.sha1(repo_url.encode()).hexdigest()
+
+    if (clone_dir / ".git").is_dir():
+        git = ["git", "-C", str(clone_dir)]
+        subprocess.run(
+            git + ["fetch", "--depth=1", "origin", branch or "HEAD"], check=True
+        )
+        subprocess.run(git + ["reset", "--hard", "FETCH_HEAD"], check=True)
+        # Mark as recently used for the LRU sweep
+        os.utime(clone_dir)
+    else:
+        cache_root.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(clone_dir, ignore_errors=True)
+        cmd = ["git", "clone", "--depth=1"]
+        if branch:
+            cmd += ["--branch", branch]
+        subprocess.run(cmd + [repo_url, str(clone_dir)], check=True)
+        _sweep_clone_cache(cache_root)
+
+    return clone_dir
+
+
 def explain_repository(
     repo_url: str, workdir: str, branch: Optional[str] = None
 ) -> str:
@@ -48,13 +107,7 @@ def explain_repository(
     terminal.
     """
     repo_name = os.path.splitext(os.path.basename(repo_url.rstrip("/")))[0]
-    repo_path = os.path.join(workdir, repo_name)
-
-    if not os.path.exists(repo_path):
-        subprocess.run(["git", "clone", repo_url, repo_path], check=True)
-    if branch:
-        subprocess.run(["git", "fetch"], cwd=repo_path, check=True)
-        subprocess.run(["git", "checkout", branch], cwd=repo_path, check=True)
+    repo_path = str(_checkout_cached_clone(repo_url, workdir, branch))
 
     summary = _summarize_repository(repo_path)
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Agents import their siblings as src.*, relative to the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
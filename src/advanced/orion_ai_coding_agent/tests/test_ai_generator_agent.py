@@ -0,0 +1,108 @@
+"""Tests for the AI Generator Agent's module-level helpers."""
+
+import asyncio
+from collections import deque
+
+from src.agents.ai_generator_agent import (
+    AIGeneratorAgent,
+    _RateLimiter,
+    _apply_line_edits,
+)
+from src.base_agent import BaseAgent
+
+
+class _FakeChain:
+    """Chain stand-in that returns a fixed result."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def invoke(self, inputs):
+        return self.result
+
+
+def _editing_agent(edits) -> AIGeneratorAgent:
+    """Build an agent whose edit chain returns the given line edits."""
+    agent = AIGeneratorAgent.__new__(AIGeneratorAgent)
+    BaseAgent.__init__(agent, "AIGenerator")
+    agent._edit_chain = _FakeChain({"edits": edits})
+    agent._modified_files = deque()
+    return agent
+
+
+def _acquire_all(limiter: _RateLimiter, *tokens: int) -> None:
+    """Acquire each reservation in turn, failing if any wait never ends."""
+
+    async def _run():
+        for count in tokens:
+            await limiter.acquire(count)
+
+    asyncio.run(asyncio.wait_for(_run(), timeout=5))
+
+
+def test_rate_limiter_tokens_only():
+    limiter = _RateLimiter(tokens_per_minute=6_000_000)
+    _acquire_all(limiter, 6_000_000, 1000)
+
+
+def test_rate_limiter_requests_only():
+    limiter = _RateLimiter(requests_per_minute=600)
+    _acquire_all(limiter, *[1] * 601)
+
+
+def test_rate_limiter_unlimited():
+    limiter = _RateLimiter()
+    _acquire_all(limiter, *[10**9] * 100)
+
+
+def test_apply_line_edits_inserts_at_eof_without_newline():
+    edits = [{"line_start": 3, "line_end": 2, "replacement": "c\n"}]
+    assert _apply_line_edits("a\nb", edits) == ("a\nb\nc\n", 1)
+
+
+def test_apply_line_edits_replaces_last_line_and_appends():
+    edits = [
+        {"line_start": 2, "line_end": 2, "replacement": "B"},
+        {"line_start": 3, "line_end": 2, "replacement": "c"},
+    ]
+    assert _apply_line_edits("a\nb", edits) == ("a\nB\nc", 2)
+
+
+def test_apply_line_edits_inserts_at_eof_with_newline():
+    edits = [{"line_start": 3, "line_end": 2, "replacement": "c"}]
+    assert _apply_line_edits("a\nb\n", edits) == ("a\nb\nc\n", 1)
+
+
+def test_modify_existing_file_edits_one_line_file(tmp_path):
+    agent = _editing_agent([{"line_start": 1, "line_end": 1, "replacement": "x = 2\n"}])
+    result = agent.modify_existing_file(
+        str(tmp_path), "m.py", "set x to 2", file_content="x = 1\n"
+    )
+    assert result == "x = 2\n"
+    assert (tmp_path / "m.py").read_text() == "x = 2\n"
+
+
+def test_modify_existing_file_accepts_insert_heavy_edits(tmp_path):
+    agent = _editing_agent(
+        [{"line_start": 4, "line_end": 3, "replacement": "d = 4\ne = 5\n"}]
+    )
+    result = agent.modify_existing_file(
+        str(tmp_path), "m.py", "add d and e", file_content="a = 1\nb = 2\nc = 3\n"
+    )
+    assert result == "a = 1\nb = 2\nc = 3\nd = 4\ne = 5\n"
+
+
+def test_modify_existing_file_accepts_new_function(tmp_path):
+    module = "".join(f"value_{i} = {i}\n" for i in range(15))
+    function = (
+        "def total():\n"
+        + "".join(f"    value_{i} += 1\n" for i in range(8))
+        + "    return value_0\n"
+    )
+    agent = _editing_agent(
+        [{"line_start": 16, "line_end": 15, "replacement": function}]
+    )
+    result = agent.modify_existing_file(
+        str(tmp_path), "m.py", "add total()", file_content=module
+    )
+    assert result == module + function